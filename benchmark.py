@@ -0,0 +1,255 @@
+"""Headless UI benchmarks for every tool.
+
+Each app is built and shown under Qt's offscreen platform and measured for:
+
+* construct_ms: building the widget
+* first_paint_ms: from show() to the first paint event
+* interactions: from a scripted click or key press to the resulting repaint
+* wakeups_per_sec: timer events while the app sits idle
+
+    python benchmark.py -o bench_baseline.json
+    python benchmark.py --compare bench_baseline.json --tolerance 0.25
+
+With --compare the run exits with status 1 when any number is worse than
+the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, QTimer, Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QPushButton
+
+from launcher import BASE_DIR, TOOLS, load_module
+import theme
+
+REPEATS = 5
+IDLE_SECONDS = 2.0
+PAINT_TIMEOUT = 2.0
+# timings below this are noise and never reported as regressions
+NOISE_MS = 1.0
+
+
+class PaintWatcher(QObject):
+    """Remembers when the watched widget was last painted"""
+
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.painted_at = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.painted_at = time.perf_counter()
+        return False
+
+    def wait(self, app, since):
+        """Process events until a paint after `since`, returns the delay in ms"""
+        self.painted_at = None
+        deadline = since + PAINT_TIMEOUT
+        while self.painted_at is None and time.perf_counter() < deadline:
+            app.processEvents(QEventLoop.AllEvents, 10)
+        self.widget.removeEventFilter(self)
+        if self.painted_at is None:
+            return None
+        return (self.painted_at - since) * 1000
+
+
+class TimerCounter(QObject):
+    """Counts timer events delivered anywhere in the application"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Timer:
+            self.count += 1
+        return False
+
+
+def button(widget, text):
+    for child in widget.findChildren(QPushButton):
+        if child.text() == text:
+            return child
+    raise LookupError(f"no button {text!r}")
+
+
+def calculator_script(widget):
+    return [(f"click {text}", lambda text=text: QTest.mouseClick(button(widget, text), Qt.LeftButton), widget.label)
+            for text in ["7", "*", "8", "+", "1", "="]]
+
+
+def stopwatch_script(widget):
+    return [
+        ("start", lambda: QTest.mouseClick(widget.start_button, Qt.LeftButton), widget.time_label),
+        ("lap", lambda: QTest.mouseClick(widget.lap_button, Qt.LeftButton), widget.lap_list.viewport()),
+        ("stop", lambda: QTest.mouseClick(widget.stop_button, Qt.LeftButton), widget.time_label),
+    ]
+
+
+def weather_script(widget):
+    return [("type city", lambda: QTest.keyClicks(widget.city_input, "Manila"), widget.city_input)]
+
+
+def todo_script(widget):
+    def add_task():
+        widget.task_input.setText("Benchmark task")
+        QTest.keyClick(widget.task_input, Qt.Key_Return)
+    return [
+        ("add task", add_task, widget.task_list.viewport()),
+        ("search", lambda: QTest.keyClicks(widget.search_input, "bench"), widget.task_list.viewport()),
+    ]
+
+
+SCRIPTS = {
+    "Calculator": calculator_script,
+    "Stopwatch": stopwatch_script,
+    "Weather": weather_script,
+    "To-Do": todo_script,
+}
+
+
+def idle_wakeups(app, seconds=IDLE_SECONDS):
+    counter = TimerCounter()
+    app.installEventFilter(counter)
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+    app.removeEventFilter(counter)
+    # the single shot that ended the loop is not the app's
+    return max(0, counter.count - 1) / seconds
+
+
+def run_once(app, title, widget_class):
+    # the to-do app saves where it runs, so every run starts from an empty
+    # directory outside the repo and doesn't load the previous run's tasks
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            return measure(app, title, widget_class)
+        finally:
+            os.chdir(cwd)
+
+
+def measure(app, title, widget_class):
+    result = {}
+    started = time.perf_counter()
+    widget = widget_class()
+    result["construct_ms"] = (time.perf_counter() - started) * 1000
+
+    watcher = PaintWatcher(widget)
+    shown = time.perf_counter()
+    widget.show()
+    result["first_paint_ms"] = watcher.wait(app, shown)
+
+    interactions = {}
+    for name, action, target in SCRIPTS.get(title, lambda widget: [])(widget):
+        watcher = PaintWatcher(target)
+        sent = time.perf_counter()
+        action()
+        interactions[name] = watcher.wait(app, sent)
+    result["interactions"] = interactions
+
+    result["wakeups_per_sec"] = idle_wakeups(app)
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return result
+
+
+def median(values):
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def run(repeats=REPEATS, only=None):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    theme.engine.apply()
+    results = {}
+    for title, filename, class_name in TOOLS:
+        if only and title not in only:
+            continue
+        widget_class = getattr(load_module(filename), class_name)
+        runs = [run_once(app, title, widget_class) for _ in range(repeats)]
+        results[title] = {
+            "construct_ms": median(r["construct_ms"] for r in runs),
+            "first_paint_ms": median(r["first_paint_ms"] for r in runs),
+            "interactions_ms": {name: median(r["interactions"][name] for r in runs)
+                                for name in runs[0]["interactions"]},
+            "wakeups_per_sec": median(r["wakeups_per_sec"] for r in runs),
+        }
+        print(f"{title}: {json.dumps(results[title])}")
+    return results
+
+
+def flatten(results):
+    flat = {}
+    for title, numbers in results.items():
+        for key, value in numbers.items():
+            if isinstance(value, dict):
+                for name, sub_value in value.items():
+                    flat[f"{title}.{key}.{name}"] = sub_value
+            else:
+                flat[f"{title}.{key}"] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """Return a line for every number worse than the baseline beyond tolerance"""
+    regressions = []
+    current = flatten(results)
+    for key, old in flatten(baseline).items():
+        new = current.get(key)
+        if old is None or new is None:
+            continue
+        slack = 0 if key.endswith("wakeups_per_sec") else NOISE_MS
+        if new > old * (1 + tolerance) + slack:
+            regressions.append(f"{key}: {old} -> {new}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every tool under the offscreen platform")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--app", action="append", help="only run this app (by tab title)")
+    args = parser.parse_args(argv)
+    # paths are relative to where the benchmark was started
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    sys.path.insert(0, BASE_DIR)
+    results = run(args.repeats, args.app)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
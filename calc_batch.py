@@ -0,0 +1,310 @@
+"""Headless batch evaluation for the calculator engine.
+
+Two modes are available, both from Python and from the command line:
+
+* ``columns``: one expression such as ``x*2+y`` evaluated over every row of
+  a CSV or .npy file. Rows are read in chunks and, when NumPy is installed,
+  each chunk is evaluated as whole arrays at once.
+* ``lines``: a file with one calculator expression per line, evaluated by
+  a pool of worker processes.
+
+Input is read and output written a chunk at a time, so files larger than
+memory can be processed.
+
+    python calc_batch.py columns "x*2+y" data.csv -o result.csv
+    python calc_batch.py lines expressions.txt -o results.txt --workers 4
+"""
+
+import argparse
+import ast
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from calc_engine import (ExpressionError, MAX_DIGITS, MODES, PRECISION, ResultTooLarge, evaluate,
+                         format_result, make_mode)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 65536
+BATCH_SIZE = 2048
+
+ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+                 ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow,
+                 ast.UAdd, ast.USub)
+
+OPERATOR_NAMES = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.FloorDiv: "//", ast.Pow: "**"}
+
+
+class ConstantFolder(ast.NodeTransformer):
+    """Work out the parts of an expression that use no column, once
+
+    The arithmetic goes through a calculator engine mode, so a constant
+    such as ``9**9**9`` is refused by its max_digits limit instead of being
+    computed again for every row.
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if not (isinstance(node.left, ast.Constant) and isinstance(node.right, ast.Constant)):
+            return node
+        try:
+            value = self.mode.apply(node.left.value, OPERATOR_NAMES[type(node.op)], node.right.value)
+        except ResultTooLarge:
+            raise
+        except ExpressionError:
+            # division by zero and the like give nan when evaluated
+            return node
+        if not isinstance(value, (int, float)):
+            # negative numbers to fractional powers are complex
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.operand, ast.Constant):
+            return node
+        value = node.operand.value
+        if isinstance(node.op, ast.USub):
+            value = self.mode.negate(value)
+        return ast.copy_location(ast.Constant(value), node)
+
+
+class BatchExpression:
+    """An arithmetic expression over named columns, compiled once.
+
+    The compiled function works on plain floats as well as NumPy arrays, so
+    the same expression runs row by row or vectorized. Constant parts are
+    worked out when compiling and may not exceed `max_digits` digits.
+    """
+
+    def __init__(self, expression, max_digits=MAX_DIGITS):
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"invalid expression: {e.msg}")
+
+        names = []
+        for node in ast.walk(tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise ExpressionError(f"unsupported syntax: {type(node).__name__}")
+            if isinstance(node, ast.Constant) and (
+                    isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+                raise ExpressionError(f"unsupported constant {node.value!r}")
+            if isinstance(node, ast.Name) and node.id not in names:
+                names.append(node.id)
+
+        self.expression = expression
+        self.names = names
+        body = ConstantFolder(make_mode("float", max_digits=max_digits)).visit(tree).body
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in names],
+                                  kwonlyargs=[], kw_defaults=[], defaults=[])
+        function = ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, body)))
+        self.function = eval(compile(function, "<expression>", "eval"), {"__builtins__": {}})
+
+    def evaluate_columns(self, columns, size):
+        """Evaluate over a dict of `size` long columns and return a list of floats"""
+        missing = [name for name in self.names if name not in columns]
+        if missing:
+            raise ExpressionError(f"unknown column(s): {', '.join(missing)}")
+        args = [columns[name] for name in self.names]
+
+        if np is not None:
+            arrays = [np.asarray(arg, dtype=float) for arg in args]
+            with np.errstate(all="ignore"):
+                try:
+                    result = self.function(*arrays)
+                except (ArithmeticError, TypeError, ValueError):
+                    # only constant parts can raise, numpy gives inf/nan instead
+                    result = float("nan")
+            if np.iscomplexobj(result):
+                # a negative constant to a fractional power, not a real number
+                result = float("nan")
+            return np.broadcast_to(np.asarray(result, dtype=float), (size,)).tolist()
+
+        if not args:
+            return [self._evaluate_row(())] * size
+        return [self._evaluate_row(row) for row in zip(*args)]
+
+    def _evaluate_row(self, row):
+        try:
+            return float(self.function(*row))
+        except (ArithmeticError, TypeError, ValueError):
+            # TypeError: negative numbers to fractional powers are complex
+            return float("nan")
+
+
+def read_csv_chunks(path, names, chunk_size=CHUNK_SIZE):
+    """Yield (row count, dict of float columns), `chunk_size` rows at a time
+
+    Blank lines are skipped; rows that are too short or not numeric raise
+    ExpressionError with their line number.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        missing = [name for name in names if name not in header]
+        if missing:
+            raise ExpressionError(f"column(s) not in {path}: {', '.join(missing)}")
+        indexes = [header.index(name) for name in names]
+
+        rows = []
+        for row in reader:
+            if not any(field.strip() for field in row):
+                continue
+            try:
+                rows.append([float(row[i]) for i in indexes])
+            except (IndexError, ValueError):
+                raise ExpressionError(f"{path} line {reader.line_num}: "
+                                      f"expected numbers in column(s) {', '.join(names)}")
+            if len(rows) == chunk_size:
+                yield len(rows), _columns(names, rows)
+                rows = []
+        if rows:
+            yield len(rows), _columns(names, rows)
+
+
+def _columns(names, rows):
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+
+def read_npy_chunks(path, names, chunk_size=CHUNK_SIZE):
+    """Yield (row count, dict of columns) from a memory mapped .npy file"""
+    if np is None:
+        raise ExpressionError(".npy files need NumPy installed")
+    data = np.load(path, mmap_mode="r")
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    if len(names) > data.shape[1]:
+        raise ExpressionError(f"{path} has {data.shape[1]} column(s), expression uses {len(names)}")
+
+    for start in range(0, data.shape[0], chunk_size):
+        chunk = data[start:start + chunk_size]
+        yield len(chunk), {name: chunk[:, i] for i, name in enumerate(names)}
+
+
+def evaluate_file(expression, input_path, output, columns=None, chunk_size=CHUNK_SIZE,
+                  max_digits=MAX_DIGITS):
+    """Evaluate `expression` over a CSV or .npy file, writing one result per row
+
+    `columns` names the columns of a .npy file in order; CSV files use their
+    header row. Returns the number of rows written.
+    """
+    compiled = BatchExpression(expression, max_digits)
+    if input_path.endswith(".npy"):
+        names = columns or compiled.names
+        chunks = read_npy_chunks(input_path, names, chunk_size)
+    else:
+        chunks = read_csv_chunks(input_path, compiled.names, chunk_size)
+
+    count = 0
+    output.write("result\n")
+    for size, chunk in chunks:
+        results = compiled.evaluate_columns(chunk, size)
+        output.write("\n".join(map(repr, results)))
+        output.write("\n")
+        count += size
+    return count
+
+
+def evaluate_line(line, mode="float", precision=PRECISION, max_digits=MAX_DIGITS):
+    """Evaluate one calculator expression, returning its result as text"""
+    try:
+        result = evaluate(line.strip(), mode, precision, max_digits)
+    except ExpressionError:
+        return "Error"
+    try:
+        return str(result)
+    except ValueError:
+        # more digits than Python will convert, write it approximately
+        return format_result(result)
+
+
+def _evaluate_batch(lines, **options):
+    return [evaluate_line(line, **options) for line in lines]
+
+
+def evaluate_many(lines, workers=None, batch_size=BATCH_SIZE, **options):
+    """Evaluate an iterable of expressions, yielding results in order
+
+    Expressions are sent to worker processes in batches and only a few
+    batches are in flight at a time, so `lines` can be an open file of any
+    size. With ``workers=1`` everything runs in this process. `options` are
+    the number mode settings passed on to evaluate_line.
+    """
+    lines = iter(lines)
+    if workers == 1:
+        for line in lines:
+            yield evaluate_line(line, **options)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = []
+        while True:
+            while len(in_flight) < workers * 2:
+                batch = list(islice(lines, batch_size))
+                if not batch:
+                    break
+                in_flight.append(pool.submit(partial(_evaluate_batch, **options), batch))
+            if not in_flight:
+                break
+            yield from in_flight.pop(0).result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate calculator expressions in bulk")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    columns_parser = subparsers.add_parser("columns", help="evaluate one expression over a CSV or .npy file")
+    columns_parser.add_argument("expression")
+    columns_parser.add_argument("input")
+    columns_parser.add_argument("-o", "--output", help="output CSV file (default: stdout)")
+    columns_parser.add_argument("--columns", help="comma separated column names for .npy input")
+    columns_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    columns_parser.add_argument("--max-digits", type=int, default=MAX_DIGITS,
+                                help="largest constant allowed, in digits")
+
+    lines_parser = subparsers.add_parser("lines", help="evaluate a file of expressions, one per line")
+    lines_parser.add_argument("input")
+    lines_parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    lines_parser.add_argument("--workers", type=int, default=None)
+    lines_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    lines_parser.add_argument("--mode", choices=list(MODES), default="float")
+    lines_parser.add_argument("--precision", type=int, default=PRECISION,
+                              help="significant digits in decimal mode")
+    lines_parser.add_argument("--max-digits", type=int, default=MAX_DIGITS,
+                              help="largest result allowed, in digits")
+
+    args = parser.parse_args(argv)
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.command == "columns":
+            columns = args.columns.split(",") if args.columns else None
+            evaluate_file(args.expression, args.input, output, columns, args.chunk_size, args.max_digits)
+        else:
+            with open(args.input) as f:
+                results = evaluate_many(f, args.workers, args.batch_size, mode=args.mode,
+                                        precision=args.precision, max_digits=args.max_digits)
+                for result in results:
+                    output.write(result + "\n")
+    except (ExpressionError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+"""Expression engine used by the calculator.
+
+It understands the expressions the calculator can build: numbers, the
+``+ - * /`` buttons and the ``**`` / ``//`` you get by pressing ``*`` or
+``/`` twice, with the same precedence as Python.
+
+Numbers follow one of several modes:
+
+* ``float``: Python's own int/float semantics, what eval would give
+* ``decimal``: decimal.Decimal rounded to a configurable precision
+* ``fraction``: exact fractions.Fraction results
+* ``integer``: whole numbers of any size, ``/`` rounds down
+
+Every mode keeps integers as plain Python ints for as long as the result
+stays exact, so ordinary arithmetic costs the same in all of them. Results
+with more than ``max_digits`` digits are refused instead of computed.
+"""
+
+import math
+from decimal import Context, Decimal
+from fractions import Fraction
+
+DIGITS = frozenset("0123456789")
+OPERATORS = frozenset("+-*/")
+
+# default limit on the size of a result, in decimal digits
+MAX_DIGITS = 100000
+# default number of significant digits in decimal mode
+PRECISION = 28
+
+# binding strength of each operator, unary signs sit between * and **
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "//": 2, "neg": 3, "pos": 3, "**": 4}
+UNARY = frozenset(("neg", "pos"))
+
+LOG10_2 = math.log10(2)
+
+
+class ExpressionError(Exception):
+    """Raised when an expression can not be evaluated."""
+
+
+class ResultTooLarge(ExpressionError):
+    """Raised when a result would have more than max_digits digits."""
+
+
+class FloatMode:
+    """Python's own number semantics, as eval would give them"""
+
+    name = "float"
+
+    def __init__(self, precision=PRECISION, max_digits=MAX_DIGITS):
+        self.precision = precision
+        self.max_digits = max_digits
+        self.max_bits = int(max_digits / LOG10_2) + 1
+
+    def parse(self, text):
+        """Turn a typed number into a value"""
+        if not text or text[-1] in "e+-":
+            raise ExpressionError(f"incomplete number {text!r}")
+        if "." in text or "e" in text:
+            if text == ".":
+                raise ExpressionError("lone decimal point")
+            return self.parse_decimals(text)
+        # Python rejects integer literals like 007, but 000 is fine
+        if len(text) > 1 and text[0] == "0" and text.strip("0"):
+            raise ExpressionError(f"leading zeros in {text!r}")
+        try:
+            return int(text)
+        except ValueError as e:
+            raise ExpressionError(str(e))
+
+    def parse_decimals(self, text):
+        return float(text)
+
+    def apply(self, left, op, right):
+        """Apply a binary operator, raising ExpressionError on math errors"""
+        try:
+            if op == "+":
+                return left + right
+            if op == "-":
+                return left - right
+            if op == "*":
+                if type(left) is int and type(right) is int:
+                    self.check_bits(left.bit_length() + right.bit_length())
+                return left * right
+            if op == "/":
+                return left / right
+            if op == "//":
+                return left // right
+            if op == "**":
+                return self.power(left, right)
+        except (ArithmeticError, ValueError) as e:
+            raise ExpressionError(str(e) or type(e).__name__)
+        raise ExpressionError(f"unknown operator {op!r}")
+
+    def negate(self, value):
+        return -value
+
+    def power(self, base, exponent):
+        if type(base) is int and type(exponent) is int and exponent > 0:
+            self.check_power(base, exponent)
+        return base ** exponent
+
+    def check_bits(self, bits):
+        """Refuse results that would have more than max_digits digits"""
+        if bits > self.max_bits:
+            raise ResultTooLarge(f"result has more than {self.max_digits} digits")
+
+    def power_fits(self, base, exponent):
+        """True when the integer ``base ** exponent`` has at most max_digits digits"""
+        base = abs(base)
+        # the result has floor(exponent * log10(base)) + 1 digits
+        return base < 2 or exponent <= 0 or exponent * math.log10(base) < self.max_digits
+
+    def check_power(self, base, exponent):
+        if not self.power_fits(base, exponent):
+            raise ResultTooLarge(f"result has more than {self.max_digits} digits")
+
+
+class DecimalMode(FloatMode):
+    """decimal.Decimal arithmetic rounded to `precision` significant digits"""
+
+    name = "decimal"
+
+    def __init__(self, precision=PRECISION, max_digits=MAX_DIGITS):
+        super().__init__(precision, max_digits)
+        self.context = Context(prec=precision)
+
+    def parse_decimals(self, text):
+        return Decimal(text)
+
+    def apply(self, left, op, right):
+        if type(left) is int and type(right) is int:
+            # exact integer results need no rounding
+            if op == "/":
+                if right and left % right == 0:
+                    return left // right
+            elif op != "**" or 0 <= right and self.power_fits(left, right):
+                return super().apply(left, op, right)
+        context = self.context
+        try:
+            if op == "+":
+                return context.add(left, right)
+            if op == "-":
+                return context.subtract(left, right)
+            if op == "*":
+                return context.multiply(left, right)
+            if op == "/":
+                return context.divide(left, right)
+            if op == "//":
+                return context.divide_int(left, right)
+            if op == "**":
+                return context.power(left, right)
+        except (ArithmeticError, ValueError) as e:
+            raise ExpressionError(str(e) or type(e).__name__)
+        raise ExpressionError(f"unknown operator {op!r}")
+
+    def negate(self, value):
+        if type(value) is int:
+            return -value
+        return self.context.minus(value)
+
+
+class FractionMode(FloatMode):
+    """Exact arithmetic with fractions.Fraction"""
+
+    name = "fraction"
+
+    def parse_decimals(self, text):
+        return Fraction(text)
+
+    def apply(self, left, op, right):
+        if op == "/":
+            if type(left) is int and type(right) is int and right and left % right == 0:
+                return left // right
+            try:
+                result = Fraction(left) / right
+            except ZeroDivisionError as e:
+                raise ExpressionError(str(e))
+        else:
+            result = super().apply(left, op, right)
+        if type(result) is Fraction:
+            self.check_bits(max(result.numerator.bit_length(), result.denominator.bit_length()))
+        return result
+
+    def power(self, base, exponent):
+        if type(exponent) is Fraction and exponent.denominator == 1:
+            exponent = exponent.numerator
+        if type(exponent) is not int:
+            # generally irrational, so fall back to float
+            return float(base) ** float(exponent)
+        if type(base) is Fraction:
+            self.check_power(max(abs(base.numerator), base.denominator), abs(exponent))
+            return base ** exponent
+        if exponent < 0:
+            self.check_power(base, -exponent)
+            return Fraction(base) ** exponent
+        return super().power(base, exponent)
+
+
+class IntegerMode(FloatMode):
+    """Whole numbers of any size, ``/`` rounds down"""
+
+    name = "integer"
+
+    def parse_decimals(self, text):
+        raise ExpressionError("integer mode has no decimals")
+
+    def apply(self, left, op, right):
+        if op == "/":
+            op = "//"
+        elif op == "**" and right < 0:
+            raise ExpressionError("negative powers are not whole numbers")
+        return super().apply(left, op, right)
+
+
+MODES = {mode.name: mode for mode in (FloatMode, DecimalMode, FractionMode, IntegerMode)}
+
+
+def make_mode(name="float", precision=PRECISION, max_digits=MAX_DIGITS):
+    """Create the number mode called `name`"""
+    try:
+        return MODES[name](precision, max_digits)
+    except KeyError:
+        raise ExpressionError(f"unknown number mode {name!r}")
+
+
+def format_result(value, max_digits=30):
+    """Text for showing `value`, cheap to build even for huge numbers
+
+    Integers and fractions too long to show are given in scientific
+    notation worked out from their logarithm, so the full digit string is
+    never built.
+    """
+    if type(value) is int:
+        if value.bit_length() * LOG10_2 < max_digits:
+            return str(value)
+        return _approximate(value)
+    if type(value) is Fraction:
+        size = max(value.numerator.bit_length(), value.denominator.bit_length())
+        if size * LOG10_2 < max_digits:
+            return str(value)
+        return _approximate(value)
+    text = str(value)
+    if type(value) is Decimal and len(text) > max_digits:
+        return f"{value:.{max(max_digits - 8, 1)}e}"
+    return text
+
+
+def _approximate(value):
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    if type(value) is Fraction:
+        exponent = math.log10(value.numerator) - math.log10(value.denominator)
+    else:
+        exponent = math.log10(value)
+    whole = math.floor(exponent)
+    mantissa = 10 ** (exponent - whole)
+    return f"≈{sign}{mantissa:.10f}e{whole:+d}"
+
+
+class LiveEvaluator:
+    """Evaluate an expression while it is being typed.
+
+    Operands and operators wait on two stacks, as in a shunting-yard parser
+    that never has to finish, and whatever can be worked out is reduced as
+    soon as the next operator arrives. Only the number currently being
+    typed is kept as text, so appending a character costs the same no
+    matter how long the expression already is.
+    """
+
+    def __init__(self, mode="float", precision=PRECISION, max_digits=MAX_DIGITS):
+        self.mode = make_mode(mode, precision, max_digits)
+        self.reset()
+
+    def reset(self):
+        """Forget everything typed so far"""
+        self.chunks = []
+        self.error = None
+        self.values = []
+        self.ops = []
+        self.number = ""
+        self.pending = None
+        self.loaded = None
+        # True while the top operand is a value that has no number text
+        self.bare_value = False
+
+    def set_mode(self, mode, precision=None, max_digits=None):
+        """Switch number mode and evaluate what was typed again"""
+        loaded = self.loaded
+        text = self.text
+        if precision is None:
+            precision = self.mode.precision
+        if max_digits is None:
+            max_digits = self.mode.max_digits
+        self.mode = make_mode(mode, precision, max_digits)
+        if loaded is not None and text.startswith("≈"):
+            # too many digits to write out, keep the value itself
+            if type(loaded) is Fraction and type(self.mode) is DecimalMode:
+                loaded = self.mode.context.divide(Decimal(loaded.numerator), Decimal(loaded.denominator))
+            self.load(loaded)
+            return
+        self.reset()
+        self.extend(text)
+
+    def load(self, value):
+        """Start over from a previous result without writing it out as text"""
+        self.reset()
+        self.loaded = value
+
+    @property
+    def text(self):
+        """The full expression typed so far"""
+        if self.loaded is not None:
+            try:
+                return str(self.loaded).replace("E", "e")
+            except ValueError:
+                return format_result(self.loaded)
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+    def tail(self, size):
+        """Return at most the last `size` characters of the expression"""
+        if self.loaded is not None:
+            return format_result(self.loaded, size)[-size:]
+        parts = []
+        count = 0
+        for chunk in reversed(self.chunks):
+            parts.append(chunk)
+            count += len(chunk)
+            if count >= size:
+                break
+        return "".join(reversed(parts))[-size:] if parts else ""
+
+    def extend(self, text):
+        """Append several characters at once"""
+        for char in text:
+            self.push(char)
+
+    def push(self, char):
+        """Append one character and update the partial result"""
+        if self.loaded is not None:
+            self._unload()
+        self.chunks.append(char)
+        if self.error is not None:
+            return
+        try:
+            self._feed(char)
+        except ExpressionError as e:
+            self.error = str(e) or "invalid expression"
+
+    def _unload(self):
+        # continue from a loaded result as if its text had been typed
+        value = self.loaded
+        try:
+            text = str(value).replace("E", "e")
+        except ValueError:
+            # too many digits to write out, keep the value itself
+            self.reset()
+            self.chunks.append(format_result(value))
+            if value < 0:
+                self.ops.append("neg")
+                value = -value
+            self.values.append(value)
+            self.bare_value = True
+            return
+        self.reset()
+        self.extend(text)
+
+    def _feed(self, char):
+        number = self.number
+        if self.pending is not None and char not in OPERATORS:
+            self._commit_pending()
+        if char in DIGITS or char == "." or char == "e":
+            if self.bare_value:
+                raise ExpressionError("result too long to edit")
+            if char == "." and ("." in number or "e" in number):
+                raise ExpressionError("misplaced decimal point")
+            if char == "e" and ("e" in number or not DIGITS.intersection(number)):
+                # only reachable when a result like 1e+20 is typed back in
+                raise ExpressionError("misplaced exponent")
+            self.number = number + char
+        elif number.endswith("e") and char in "+-":
+            self.number = number + char
+        elif number:
+            self.values.append(self.mode.parse(number))
+            self.number = ""
+            self.pending = char
+        elif self.bare_value:
+            self.bare_value = False
+            self.pending = char
+        else:
+            self._after_operator(char)
+
+    def _after_operator(self, char):
+        pending = self.pending
+        if pending in ("*", "/") and char == pending:
+            self.pending = pending + char
+            return
+        if pending is not None:
+            self._commit_pending()
+        if char == "-":
+            self.ops.append("neg")
+        elif char == "+":
+            self.ops.append("pos")
+        else:
+            raise ExpressionError(f"unexpected operator {char!r}")
+
+    def _commit_pending(self):
+        op = self.pending
+        self.pending = None
+        precedence = PRECEDENCE[op]
+        ops = self.ops
+        # ** groups to the right, everything else to the left
+        while ops and (PRECEDENCE[ops[-1]] > precedence or
+                       PRECEDENCE[ops[-1]] == precedence and op != "**"):
+            self._reduce(self.values, ops)
+        ops.append(op)
+
+    def _reduce(self, values, ops):
+        op = ops.pop()
+        if op in UNARY:
+            if op == "neg":
+                values[-1] = self.mode.negate(values[-1])
+            return
+        right = values.pop()
+        values[-1] = self.mode.apply(values[-1], op, right)
+
+    @property
+    def complete(self):
+        """True when the expression ends in a number"""
+        if self.error is not None:
+            return False
+        if self.loaded is not None:
+            return True
+        return bool(self.number) and self.number[-1] not in "e+-"
+
+    def value(self):
+        """Current value of the expression, or None when it has none yet"""
+        if not self.complete:
+            return None
+        try:
+            return self._value()
+        except ExpressionError:
+            return None
+
+    def _value(self):
+        if self.loaded is not None:
+            return self.loaded
+        values = self.values + [self.mode.parse(self.number)]
+        ops = list(self.ops)
+        while ops:
+            self._reduce(values, ops)
+        return values[0]
+
+    def result(self):
+        """Final value of the expression, raising ExpressionError if invalid"""
+        if self.error is not None:
+            raise ExpressionError(self.error)
+        if not self.complete:
+            raise ExpressionError("incomplete expression")
+        return self._value()
+
+
+def evaluate(expression, mode="float", precision=PRECISION, max_digits=MAX_DIGITS):
+    """Evaluate a whole expression string"""
+    evaluator = LiveEvaluator(mode, precision, max_digits)
+    evaluator.extend(expression)
+    return evaluator.result()
@@ -1,13 +1,24 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QGridLayout
-from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QGridLayout, QComboBox
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
+from calc_engine import LiveEvaluator, ExpressionError, MODES, format_result
+from resources import app_icon
+import stall_watchdog
+import theme
+
+# characters that can be typed or pasted into the expression
+ALLOWED_CHARS = "0123456789.+-*/"
+# how much of a long expression the display label shows
+DISPLAY_CHARS = 40
 
 class Widget(QWidget):
     def __init__(self):
         super().__init__()
+        self.evaluator = LiveEvaluator()
         self.current_expression = "" 
         self.initUI()
-        self.setWindowIcon(QIcon("profile.jpg"))
+        self.setWindowIcon(app_icon())
 
     def initUI(self):
         vbox = QVBoxLayout()
@@ -17,6 +28,17 @@ class Widget(QWidget):
         self.label.setStyleSheet("font-size: 24px; padding: 10px;")
         vbox.addWidget(self.label)
 
+        # Live result preview
+        self.preview_label = QLabel("", self)
+        self.preview_label.setObjectName("preview")
+        vbox.addWidget(self.preview_label)
+
+        # Number mode
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems(list(MODES))
+        self.mode_combo.currentTextChanged.connect(self.modeChanged)
+        vbox.addWidget(self.mode_combo)
+
         # Grid layout for buttons
         grid = QGridLayout()
         self.buttons = [
@@ -42,36 +64,28 @@ class Widget(QWidget):
         self.setLayout(vbox)
         self.setWindowTitle("Basic Calcu ni Shaira")
         self.resize(300, 200)
-        self.setStyleSheet("""
-                QPushButton {
-                    font-size: 20px;
-                    background-color: hsl(308, 100%, 76.3%);
-                    color: white;
-                    padding: 5px;
-                    border-radius: 10px;
-                }
-                QPushButton:hover {
-                    background-color: hsl(308, 100%, 65.3%);
-                }
-                QPushButton:pressed {
-                    background-color: hsl(308, 100%, 25.3%);
-                }
-                QLabel {
-                    font-size: 24px;
-                    padding: 10px;
-                    background-color: white;
-                    border: 5px double black;
-                }
-        """)
+        self.setStyleSheet(theme.stylesheet("calculator"))
+
+    @property
+    def current_expression(self):
+        return self.evaluator.text
+
+    @current_expression.setter
+    def current_expression(self, text):
+        self.evaluator.reset()
+        self.evaluator.extend(text)
 
     def buttonClicked(self):
         button = self.sender()
-        text = button.text()
+        self.handleInput(button.text())
 
+    def handleInput(self, text):
         if text == "C":
             self.current_expression = ""
             self.label.setText("0")
+            self.preview_label.clear()
         elif text == "=":
+            self.preview_label.clear()
             if self.current_expression == "143": 
                 self.label.setText("I love Shaira")
                 self.current_expression = "" 
@@ -80,19 +94,55 @@ class Widget(QWidget):
                 self.current_expression = ""
             else:
                 try:
-                    result = eval(self.current_expression)
-                    self.label.setText(str(result))
-                    self.current_expression = str(result)
-                except Exception:
+                    result = self.evaluator.result()
+                    self.label.setText(format_result(result, DISPLAY_CHARS))
+                    self.evaluator.load(result)
+                except ExpressionError:
                     self.label.setText("Error")
                     self.current_expression = ""
         else:
-            self.current_expression += text
-            self.label.setText(self.current_expression)
+            self.appendText(text)
+
+    def appendText(self, text):
+        self.evaluator.extend(text)
+        self.updateDisplay()
+
+    def updateDisplay(self):
+        expression = self.evaluator.tail(DISPLAY_CHARS + 1)
+        if len(expression) > DISPLAY_CHARS:
+            expression = "…" + expression[1 - DISPLAY_CHARS:]
+        self.label.setText(expression or "0")
+
+        value = self.evaluator.value()
+        if value is not None:
+            self.preview_label.setText(f"= {format_result(value, DISPLAY_CHARS)}")
+        elif self.evaluator.error is not None:
+            self.preview_label.clear()
+
+    def modeChanged(self, mode):
+        self.evaluator.set_mode(mode)
+        self.updateDisplay()
+
+    def pasteText(self, text):
+        self.appendText("".join(char for char in text if char in ALLOWED_CHARS))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Paste):
+            self.pasteText(QApplication.clipboard().text())
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Equal):
+            self.handleInput("=")
+        elif event.key() in (Qt.Key_Escape, Qt.Key_C):
+            self.handleInput("C")
+        elif event.text() and event.text() in ALLOWED_CHARS:
+            self.appendText(event.text())
+        else:
+            super().keyPressEvent(event)
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    stall_watchdog.install(app)
+    theme.engine.apply()
     widget = Widget()
     widget.show()
     sys.exit(app.exec_())
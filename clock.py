@@ -1,15 +1,33 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout
-from PyQt5.QtCore import QTimer, QTime, Qt
-from PyQt5.QtGui import QIcon
+import logging
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QGridLayout, QScrollArea
+from PyQt5.QtCore import QTimer, QTime, QDateTime, QTimeZone, Qt, QEvent
+from resources import app_icon
+import stall_watchdog
+import theme
+
+logger = logging.getLogger("clock")
+
+# fire a little after the second changes so the new second is always shown
+TICK_SLACK_MS = 5
+
+DEFAULT_ZONES = ["Asia/Manila", "Asia/Tokyo", "Australia/Sydney", "Europe/London",
+                 "Europe/Paris", "America/New_York", "America/Los_Angeles", "UTC"]
+
+# "hh:mm AP" for every minute of the day and the weekday names, built once
+# so the world clock never formats a time at run time
+MINUTE_TEXT = [f"{(minute // 60) % 12 or 12:02}:{minute % 60:02} {'AM' if minute < 720 else 'PM'}"
+               for minute in range(1440)]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
 class DigitalClock(QWidget):
     def __init__(self):
         super().__init__()
         self.time_label = QLabel(self)
         self.timer = QTimer(self)                         
+        self.wakeups = 0
         self.initUI()
-        self.setWindowIcon(QIcon("profile.jpg"))
+        self.setWindowIcon(app_icon())
 
 
     def initUI(self):
@@ -20,22 +38,144 @@ class DigitalClock(QWidget):
         self.setLayout(vbox)
 
         self.time_label.setAlignment(Qt.AlignCenter)
-        self.time_label.setStyleSheet("font-size:150px;"
-                                      "font-family:courier new;"
-                                      "color:Yellow;")
-        self.setStyleSheet("background-color:black;")
+        self.time_label.setObjectName("time_label")
+        self.setStyleSheet(theme.stylesheet("clock"))
 
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)
+        # one single-shot tick per second, re-aimed at the next second boundary
+        # every time so it never drifts and catches up after suspend or clock changes
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
 
         self.update_time()
 
+    def tick(self):
+        self.wakeups += 1
+        self.update_time()
+        self.schedule_tick()
+
+    def schedule_tick(self):
+        # window(): inside the launcher only the top-level window is minimized
+        if self.isVisible() and not self.window().isMinimized():
+            self.timer.start(1000 - QTime.currentTime().msec() + TICK_SLACK_MS)
+        else:
+            self.timer.stop()
+
     def update_time(self):
         current_time = QTime.currentTime().toString("hh:mm:ss AP")
-        self.time_label.setText(current_time)
+        if current_time != self.time_label.text():
+            self.time_label.setText(current_time)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_time()
+        self.schedule_tick()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.schedule_tick()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_time()
+            self.schedule_tick()
+
+
+class ZoneRow:
+    """One time zone of the world clock
+
+    The UTC offset is cached together with the time of the zone's next
+    transition and only looked up again once that time has passed.
+    """
+
+    def __init__(self, zone_id, zone, parent):
+        self.zone_id = zone_id
+        self.zone = zone
+        self.valid_until = -1
+        self.offset = 0
+        self.name_label = QLabel(zone_id, parent)
+        self.time_label = QLabel(parent)
+        self.day_label = QLabel(parent)
+
+    def refresh_offset(self, utc):
+        now = QDateTime.fromSecsSinceEpoch(utc, Qt.UTC)
+        self.offset = self.zone.offsetFromUtc(now)
+        self.name_label.setText(f"{self.zone_id} ({self.zone.abbreviation(now)})")
+        transition = self.zone.nextTransition(now).atUtc
+        self.valid_until = transition.toSecsSinceEpoch() if transition.isValid() else None
+
+    def update(self, utc):
+        if self.valid_until is not None and utc >= self.valid_until:
+            self.refresh_offset(utc)
+        local = utc + self.offset
+        time_text = MINUTE_TEXT[local // 60 % 1440]
+        if time_text != self.time_label.text():
+            self.time_label.setText(time_text)
+        day_text = WEEKDAYS[(local // 86400 + 3) % 7]
+        if day_text != self.day_label.text():
+            self.day_label.setText(day_text)
+
+
+class WorldClock(DigitalClock):
+    """Local time with seconds on top and hh:mm for any number of zones
+
+    Zone offsets are whole minutes, so the zones all change together once a
+    minute; every other tick only updates the local clock, which keeps the
+    per-second cost the same whatever the number of zones.
+    """
+
+    def __init__(self, zone_ids=DEFAULT_ZONES):
+        self.zone_ids = zone_ids
+        self.rows = []
+        self.shown_minute = None
+        super().__init__()
+
+    def initUI(self):
+        super().initUI()
+        self.setWindowTitle("World Clock")
+        self.setGeometry(600, 200, 700, 600)
+        self.setStyleSheet(theme.stylesheet("world_clock"))
+
+        zones = QWidget()
+        grid = QGridLayout(zones)
+        for zone_id in self.zone_ids:
+            zone = QTimeZone(zone_id.encode())
+            if not zone.isValid():
+                logger.warning("Unknown time zone: %s", zone_id)
+                continue
+            row = ZoneRow(zone_id, zone, zones)
+            line = len(self.rows)
+            grid.addWidget(row.name_label, line, 0)
+            grid.addWidget(row.time_label, line, 1, Qt.AlignRight)
+            grid.addWidget(row.day_label, line, 2, Qt.AlignRight)
+            self.rows.append(row)
+
+        scroll = QScrollArea(self)
+        scroll.setWidget(zones)
+        scroll.setWidgetResizable(True)
+        self.layout().addWidget(scroll, 1)
+        # the first update_time ran before there were any rows
+        self.shown_minute = None
+        self.update_time()
+
+    def update_time(self):
+        super().update_time()
+        utc = QDateTime.currentSecsSinceEpoch()
+        if utc // 60 != self.shown_minute:
+            self.shown_minute = utc // 60
+            for row in self.rows:
+                row.update(utc)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    clock = DigitalClock()
+    stall_watchdog.install(app)
+    theme.engine.apply()
+    if "--world" in sys.argv:
+        zone_ids = [arg for arg in sys.argv[1:] if arg != "--world"]
+        clock = WorldClock(zone_ids or DEFAULT_ZONES)
+    else:
+        clock = DigitalClock()
     clock.show()
     sys.exit(app.exec_())
\ No newline at end of file
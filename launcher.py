@@ -0,0 +1,109 @@
+import sys
+import os
+import importlib.util
+from PyQt5.QtWidgets import QApplication, QTabWidget, QWidget, QPushButton
+from resources import app_icon, app_font
+import stall_watchdog
+import theme
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# tab title, source file, widget class
+TOOLS = [
+    ("Calculator", "calcu.py", "Widget"),
+    ("Clock", "clock.py", "DigitalClock"),
+    ("Stopwatch", "stopwatch.py", "Stopwatch"),
+    ("Weather", "weather_app.py", "WeatherApp"),
+    ("To-Do", "todo PYQT5.py", "TodoApp"),
+]
+
+
+def load_module(filename):
+    """Import a tool's source file once, by path since some names aren't importable"""
+    name = os.path.splitext(filename)[0].replace(" ", "_").lower()
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BASE_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class Launcher(QTabWidget):
+    """All the tools as tabs of one window in one QApplication
+
+    Each tab starts as an empty placeholder; the tool's module is imported
+    and its widget built the first time the tab is opened.
+    """
+
+    def __init__(self, tools=TOOLS):
+        super().__init__()
+        self.tools = tools
+        self.setWindowTitle("Shaira's Tools")
+        self.setWindowIcon(app_icon())
+        self.resize(900, 700)
+        for title, _, _ in tools:
+            self.addTab(QWidget(), title)
+
+        self.theme_button = QPushButton(self)
+        self.theme_button.clicked.connect(theme.engine.toggle)
+        self.setCornerWidget(self.theme_button)
+        theme.engine.changed.connect(self.theme_changed)
+        self.theme_changed(theme.engine.current or "light")
+
+        self.currentChanged.connect(self.open_tab)
+        self.open_tab(self.currentIndex())
+
+    def is_loaded(self, index):
+        return self.widget(index).property("loaded") is True
+
+    def open_tab(self, index):
+        if index < 0 or self.is_loaded(index):
+            return
+        title, filename, class_name = self.tools[index]
+        try:
+            module = load_module(filename)
+            tool = getattr(module, class_name)()
+        except Exception as e:
+            print(f"Error opening {title}: {e}")
+            return
+        tool.setProperty("loaded", True)
+
+        placeholder = self.widget(index)
+        self.blockSignals(True)
+        self.removeTab(index)
+        self.insertTab(index, tool, title)
+        self.setCurrentIndex(index)
+        self.blockSignals(False)
+        placeholder.deleteLater()
+
+    def theme_changed(self, name):
+        self.theme_button.setText("Light Mode" if name == "dark" else "Dark Mode")
+
+    def open_tool(self, title):
+        """Switch to the tab called `title`"""
+        for index, (tool_title, _, _) in enumerate(self.tools):
+            if tool_title.lower() == title.lower():
+                self.setCurrentIndex(index)
+                return
+
+
+def main():
+    app = QApplication(sys.argv)
+    stall_watchdog.install(app)
+    app.setApplicationName("Shaira's Tools")
+    app.setFont(app_font())
+    theme.engine.apply()
+    os.chdir(BASE_DIR)
+
+    launcher = Launcher()
+    if len(sys.argv) > 1:
+        launcher.open_tool(sys.argv[1])
+    launcher.show()
+
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
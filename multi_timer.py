@@ -0,0 +1,206 @@
+import sys
+from datetime import datetime, timedelta
+from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QListView, QTimeEdit, QAbstractItemView)
+from PyQt5.QtCore import Qt, QTime, QPoint, QEvent, QAbstractListModel, QModelIndex
+from resources import app_icon
+import stall_watchdog
+import theme
+from stopwatch import format_time
+from timer_engine import QtScheduler, StopwatchTimer, CountdownTimer, AlarmTimer, NS_PER_MS
+
+# how often the visible rows are redrawn
+REFRESH_NS = 100 * NS_PER_MS
+
+
+class TimerListModel(QAbstractListModel):
+    """List model over the timers, text is built only for rows on screen"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timers = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.timers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        timer = self.timers[index.row()]
+        return f"{timer.name:<16}{timer.kind:<11}{format_time(timer.shown_ns())}   {timer.status()}"
+
+    def add(self, timer):
+        row = len(self.timers)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.timers.append(timer)
+        self.endInsertRows()
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        timer = self.timers.pop(row)
+        self.endRemoveRows()
+        return timer
+
+    def refresh(self, first, last):
+        if first <= last:
+            self.dataChanged.emit(self.index(first), self.index(last), [Qt.DisplayRole])
+
+
+class MultiTimer(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.scheduler = QtScheduler(self)
+        self.model = TimerListModel(self)
+        self.timer_list = QListView(self)
+        self.duration_edit = QTimeEdit(QTime(0, 5, 0), self)
+        self.alarm_edit = QTimeEdit(QTime.currentTime().addSecs(3600), self)
+        self.add_stopwatch_button = QPushButton("Add Stopwatch", self)
+        self.add_countdown_button = QPushButton("Add Countdown", self)
+        self.add_alarm_button = QPushButton("Add Alarm", self)
+        self.start_button = QPushButton("Start", self)
+        self.stop_button = QPushButton("Stop", self)
+        self.reset_button = QPushButton("Reset", self)
+        self.remove_button = QPushButton("Remove", self)
+        self.count_label = QLabel(self)
+        self.refresh_handle = None
+        self.counter = 0
+        self.setWindowIcon(app_icon())
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Timers")
+        self.resize(700, 500)
+
+        vbox = QVBoxLayout()
+
+        add_box = QHBoxLayout()
+        add_box.addWidget(self.add_stopwatch_button)
+        add_box.addWidget(self.duration_edit)
+        add_box.addWidget(self.add_countdown_button)
+        add_box.addWidget(self.alarm_edit)
+        add_box.addWidget(self.add_alarm_button)
+        vbox.addLayout(add_box)
+
+        self.duration_edit.setDisplayFormat("HH:mm:ss")
+        self.alarm_edit.setDisplayFormat("hh:mm:ss AP")
+
+        self.timer_list.setModel(self.model)
+        self.timer_list.setUniformItemSizes(True)
+        self.timer_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        vbox.addWidget(self.timer_list)
+
+        control_box = QHBoxLayout()
+        control_box.addWidget(self.start_button)
+        control_box.addWidget(self.stop_button)
+        control_box.addWidget(self.reset_button)
+        control_box.addWidget(self.remove_button)
+        control_box.addStretch()
+        control_box.addWidget(self.count_label)
+        vbox.addLayout(control_box)
+
+        self.setLayout(vbox)
+        self.setStyleSheet(theme.stylesheet("timers"))
+
+        self.add_stopwatch_button.clicked.connect(self.add_stopwatch)
+        self.add_countdown_button.clicked.connect(self.add_countdown)
+        self.add_alarm_button.clicked.connect(self.add_alarm)
+        self.start_button.clicked.connect(lambda: self.for_selected(lambda timer: timer.start()))
+        self.stop_button.clicked.connect(lambda: self.for_selected(lambda timer: timer.stop()))
+        self.reset_button.clicked.connect(lambda: self.for_selected(lambda timer: timer.reset()))
+        self.remove_button.clicked.connect(self.remove_selected)
+        self.update_count()
+
+    def next_name(self, kind):
+        self.counter += 1
+        return f"{kind} {self.counter}"
+
+    def add_timer(self, timer):
+        self.model.add(timer)
+        self.update_refresh()
+
+    def add_stopwatch(self):
+        self.add_timer(StopwatchTimer(self.scheduler, self.next_name("Stopwatch")))
+
+    def add_countdown(self):
+        duration = QTime(0, 0).msecsTo(self.duration_edit.time()) * NS_PER_MS
+        self.add_timer(CountdownTimer(self.scheduler, self.next_name("Countdown"), duration, self.timer_done))
+
+    def add_alarm(self):
+        now = datetime.now()
+        alarm_time = self.alarm_edit.time().toPyTime()
+        at = datetime.combine(now.date(), alarm_time)
+        if at <= now:
+            at += timedelta(days=1)
+        alarm = AlarmTimer(self.scheduler, self.next_name("Alarm"), at, self.timer_done)
+        self.add_timer(alarm)
+        alarm.start()
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.timer_list.selectionModel().selectedIndexes())
+
+    def for_selected(self, action):
+        rows = self.selected_rows()
+        for row in rows:
+            action(self.model.timers[row])
+        if rows:
+            self.model.refresh(rows[0], rows[-1])
+        self.update_refresh()
+
+    def remove_selected(self):
+        for row in reversed(self.selected_rows()):
+            self.model.remove(row).discard()
+        self.update_refresh()
+
+    def timer_done(self, timer):
+        QApplication.beep()
+        row = self.model.timers.index(timer)
+        self.model.refresh(row, row)
+        self.update_refresh()
+
+    def update_count(self):
+        running = sum(1 for timer in self.model.timers if timer.running)
+        self.count_label.setText(f"{len(self.model.timers)} timers, {running} running")
+
+    def update_refresh(self):
+        """Keep one shared redraw tick while anything is running and visible"""
+        self.update_count()
+        # window(): inside the launcher only the top-level window is minimized
+        needed = self.isVisible() and not self.window().isMinimized() and any(
+            timer.running for timer in self.model.timers)
+        if needed and self.refresh_handle is None:
+            self.refresh_handle = self.scheduler.call_every(REFRESH_NS, self.refresh_visible)
+        elif not needed and self.refresh_handle is not None:
+            self.scheduler.cancel(self.refresh_handle)
+            self.refresh_handle = None
+
+    def refresh_visible(self):
+        """Redraw only the rows that are on screen"""
+        viewport = self.timer_list.viewport()
+        first = self.timer_list.indexAt(QPoint(0, 0))
+        last = self.timer_list.indexAt(QPoint(0, viewport.height() - 1))
+        if not first.isValid():
+            return
+        last_row = last.row() if last.isValid() else self.model.rowCount() - 1
+        self.model.refresh(first.row(), last_row)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_refresh()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_refresh()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    stall_watchdog.install(app)
+    theme.engine.apply()
+    multi_timer = MultiTimer()
+    multi_timer.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,106 @@
+"""Recurring to-do tasks.
+
+A recurring task is stored once, as a rule: the usual task fields plus
+'repeat' ('daily', 'weekly' or 'monthly'), with 'due_date' as the first
+occurrence. Occurrences are generated when they are asked for and never
+stored, so a rule costs the same after years as on its first day.
+
+Completed occurrences are kept as exceptions to the rule: 'done_through' is
+the date up to which every occurrence is done and 'done' lists the few done
+dates after it. Completing occurrences in order only moves 'done_through'.
+"""
+
+import calendar
+from datetime import date, timedelta
+
+REPEATS = ("daily", "weekly", "monthly")
+
+
+def occurrence(first, repeat, n):
+    """The date of occurrence number `n`, counting `first` as 0"""
+    if repeat == "daily":
+        return first + timedelta(days=n)
+    if repeat == "weekly":
+        return first + timedelta(weeks=n)
+    # monthly on the same day, or the month's last day if it is shorter
+    month = first.month - 1 + n
+    year = first.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(first.day, calendar.monthrange(year, month)[1]))
+
+
+def first_index(first, repeat, day):
+    """Number of the first occurrence on or after `day`"""
+    if day <= first:
+        return 0
+    if repeat == "daily":
+        return (day - first).days
+    if repeat == "weekly":
+        return -(-(day - first).days // 7)
+    n = (day.year - first.year) * 12 + day.month - first.month
+    return n if occurrence(first, repeat, n) >= day else n + 1
+
+
+def occurrences(rule, start=None, end=None):
+    """Yield the dates of `rule`'s occurrences between `start` and `end`
+
+    Both ends are inclusive and optional; without `end` it never stops.
+    """
+    first = date.fromisoformat(rule['due_date'])
+    repeat = rule['repeat']
+    n = first_index(first, repeat, start) if start else 0
+    while True:
+        day = occurrence(first, repeat, n)
+        if end is not None and day > end:
+            return
+        yield day
+        n += 1
+
+
+def open_occurrences(rule, start=None, end=None):
+    """Like occurrences() but skipping the completed ones"""
+    through = rule.get('done_through')
+    if through:
+        after = date.fromisoformat(through) + timedelta(days=1)
+        start = max(start, after) if start else after
+    done = set(rule.get('done', ()))
+    for day in occurrences(rule, start, end):
+        if day.isoformat() not in done:
+            yield day
+
+
+def next_open(rule):
+    """The first occurrence that is not completed yet"""
+    return next(open_occurrences(rule))
+
+
+def due_date(task):
+    """When a task is due next as "yyyy-MM-dd", or None"""
+    if task.get('repeat') in REPEATS:
+        return next_open(task).isoformat()
+    return task.get('due_date')
+
+
+def complete(rule, day):
+    """Record the occurrence on `day` as done"""
+    through = rule.get('done_through')
+    if through and day.isoformat() <= through:
+        return
+    done = set(rule.get('done', ()))
+    done.add(day.isoformat())
+    # fold the done dates that directly follow done_through into it
+    start = date.fromisoformat(through) + timedelta(days=1) if through else None
+    for occurrence_day in occurrences(rule, start):
+        text = occurrence_day.isoformat()
+        if text not in done:
+            break
+        done.discard(text)
+        rule['done_through'] = text
+    rule['done'] = sorted(done)
+
+
+def restart(rule, first):
+    """Start the rule over from `first`, forgetting the completed occurrences"""
+    rule['due_date'] = first
+    rule.pop('done_through', None)
+    rule['done'] = []
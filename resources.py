@@ -0,0 +1,18 @@
+"""Icon and font shared by all the tools, loaded once per process."""
+
+from functools import lru_cache
+from PyQt5.QtGui import QIcon, QFont
+
+ICON_FILE = "profile.jpg"
+
+
+@lru_cache(maxsize=None)
+def app_icon():
+    """The window icon every tool uses"""
+    return QIcon(ICON_FILE)
+
+
+@lru_cache(maxsize=None)
+def app_font():
+    """Application-wide font"""
+    return QFont("Segoe UI", 10)
@@ -0,0 +1,153 @@
+"""Detect and report event loop stalls.
+
+The GUI thread's event dispatcher says when it wakes up (``awake``) and when
+it is about to wait for events again (``aboutToBlock``); the time between
+the two is how long the loop was busy. A helper thread watches that time
+and, if a busy period runs past the threshold, logs the GUI thread's Python
+stack while it is still stuck. The stall's length is recorded once the loop
+gets back to waiting. Nothing is ever posted to the GUI thread, so an idle
+app is not woken up at all and the helper thread sleeps too.
+
+Every app calls ``install()`` right after creating its QApplication. Set
+STALL_STATS_FILE to write the statistics as JSON when the app quits.
+
+Stacks are only sampled while the GUI thread lets go of the GIL, so a stall
+inside a single long C call is reported when that call returns.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from PyQt5.QtCore import QAbstractEventDispatcher, QObject
+from PyQt5.QtWidgets import QApplication
+
+logger = logging.getLogger("stall_watchdog")
+
+THRESHOLD_MS = 200
+# how often a stuck loop is checked on again, on the helper thread only
+INTERVAL_MS = 100
+
+
+class StallWatchdog(QObject):
+    def __init__(self, threshold_ms=THRESHOLD_MS, interval_ms=INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.gui_thread_id = threading.get_ident()
+        # start of the current busy period, None while the loop waits
+        self.busy_since = None
+        self.busy = threading.Event()
+        self.stopping = threading.Event()
+        self.reported = None
+        self.thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+
+        self.busy_periods = 0
+        self.stall_count = 0
+        self.total_stall = 0.0
+        self.max_stall = 0.0
+        self.max_busy = 0.0
+        self.recent_stalls = deque(maxlen=100)
+
+        self.dispatcher = QAbstractEventDispatcher.instance()
+        self.dispatcher.awake.connect(self._awake)
+        self.dispatcher.aboutToBlock.connect(self._about_to_block)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.dispatcher.awake.disconnect(self._awake)
+        self.dispatcher.aboutToBlock.disconnect(self._about_to_block)
+        self.stopping.set()
+        self.busy.set()
+        if self.thread.is_alive():
+            self.thread.join(1)
+
+    def _awake(self):
+        if self.busy_since is None:
+            self.busy_since = time.monotonic()
+            self.busy.set()
+
+    def _about_to_block(self):
+        since = self.busy_since
+        if since is None:
+            return
+        self.busy.clear()
+        self.busy_since = None
+        self._record(time.monotonic() - since)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            # sleeps for as long as the loop is idle
+            self.busy.wait()
+            since = self.busy_since
+            if self.stopping.is_set():
+                break
+            if since is None:
+                continue
+            remaining = since + self.threshold - time.monotonic()
+            if remaining > 0:
+                self.stopping.wait(remaining)
+            elif since != self.reported:
+                self.reported = since
+                self._report_stuck()
+            else:
+                # still stuck in the period already reported
+                self.stopping.wait(self.interval)
+
+    def _report_stuck(self):
+        frame = sys._current_frames().get(self.gui_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no stack)\n"
+        logger.warning("Event loop blocked for more than %d ms, GUI thread is at:\n%s",
+                       self.threshold * 1000, stack)
+
+    def _record(self, busy):
+        self.busy_periods += 1
+        self.max_busy = max(self.max_busy, busy)
+        if busy < self.threshold:
+            return
+        self.stall_count += 1
+        self.total_stall += busy
+        self.max_stall = max(self.max_stall, busy)
+        self.recent_stalls.append(round(busy * 1000, 1))
+        logger.warning("Event loop stall ended after %.0f ms", busy * 1000)
+
+    def stats(self):
+        """Stall counts and durations so far, in milliseconds"""
+        return {
+            "busy_periods": self.busy_periods,
+            "threshold_ms": self.threshold * 1000,
+            "stall_count": self.stall_count,
+            "total_stall_ms": round(self.total_stall * 1000, 1),
+            "max_stall_ms": round(self.max_stall * 1000, 1),
+            "max_busy_ms": round(self.max_busy * 1000, 1),
+            "recent_stalls_ms": list(self.recent_stalls),
+        }
+
+    def write_stats(self, path):
+        try:
+            with open(path, "w") as f:
+                json.dump(self.stats(), f, indent=2)
+        except OSError as e:
+            print(f"Error saving stall statistics: {e}")
+
+
+def install(app=None, threshold_ms=THRESHOLD_MS, interval_ms=INTERVAL_MS):
+    """Start watching `app`'s event loop until it quits"""
+    app = app or QApplication.instance()
+    watchdog = StallWatchdog(threshold_ms, interval_ms, app)
+    stats_file = os.environ.get("STALL_STATS_FILE")
+
+    def finish():
+        watchdog.stop()
+        if stats_file:
+            watchdog.write_stats(stats_file)
+
+    app.aboutToQuit.connect(finish)
+    watchdog.start()
+    return watchdog
@@ -1,18 +1,136 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout
-from PyQt5.QtCore import QTime, QTimer, Qt
-from PyQt5.QtGui import QIcon
+import csv
+import time
+from array import array
+from bisect import insort
+from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout,
+                             QListView, QFileDialog, QMessageBox)
+from PyQt5.QtCore import QTimer, Qt, QEvent, QAbstractListModel, QModelIndex
+from resources import app_icon
+import stall_watchdog
+import theme
+
+# the display shows hundredths, redrawing faster than this is wasted
+MIN_FRAME_MS = 10
+
+
+def format_time(elapsed_ns):
+    centiseconds = elapsed_ns // 10_000_000
+    seconds, centiseconds = divmod(centiseconds, 100)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}:{centiseconds:02}"
+
+
+class LapRecorder:
+    """Lap times kept as arrays of nanosecond ints, with running statistics
+
+    `splits` holds the elapsed time at each lap and `sorted_laps` the lap
+    durations in order, so min/max/mean are kept up to date as laps come in
+    and percentiles are a single lookup. 100k laps take about 1.6 MB.
+    """
 
-class Stopwatch(QWidget):
     def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.splits = array("q")
+        self.sorted_laps = array("q")
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    def __len__(self):
+        return len(self.splits)
+
+    def add(self, split_ns):
+        """Record a lap ending at `split_ns` and return its duration"""
+        lap = split_ns - (self.splits[-1] if self.splits else 0)
+        self.splits.append(split_ns)
+        insort(self.sorted_laps, lap)
+        self.total += lap
+        if self.minimum is None or lap < self.minimum:
+            self.minimum = lap
+        if self.maximum is None or lap > self.maximum:
+            self.maximum = lap
+        return lap
+
+    def lap(self, index):
+        return self.splits[index] - (self.splits[index - 1] if index else 0)
+
+    def mean(self):
+        return self.total // len(self.splits) if self.splits else None
+
+    def percentile(self, percent):
+        """Nearest-rank percentile of the lap durations"""
+        if not self.sorted_laps:
+            return None
+        rank = max(1, -(-percent * len(self.sorted_laps) // 100))
+        return self.sorted_laps[rank - 1]
+
+    def write_csv(self, f):
+        writer = csv.writer(f)
+        writer.writerow(["lap", "lap_ns", "split_ns"])
+        previous = 0
+        for number, split in enumerate(self.splits, 1):
+            writer.writerow([number, split - previous, split])
+            previous = split
+
+
+class LapModel(QAbstractListModel):
+    """Read-only list model over a LapRecorder, rows are formatted when shown
+
+    Laps are added and cleared through the model so views are told before
+    the recorder changes.
+    """
+
+    def __init__(self, laps, parent=None):
+        super().__init__(parent)
+        self.laps = laps
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.laps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        # newest lap first
+        row = len(self.laps) - 1 - index.row()
+        lap = format_time(self.laps.lap(row))
+        split = format_time(self.laps.splits[row])
+        return f"Lap {row + 1:>6}    {lap}    {split}"
+
+    def add_lap(self, split_ns):
+        """Record a lap, shown as the new first row"""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        lap = self.laps.add(split_ns)
+        self.endInsertRows()
+        return lap
+
+    def clear(self):
+        self.beginResetModel()
+        self.laps.clear()
+        self.endResetModel()
+
+class Stopwatch(QWidget):
+    def __init__(self, clock=time.monotonic_ns):
         super().__init__()
-        self.time = QTime(0,0,0,0)
+        # elapsed time is always read from the clock, timer ticks only redraw
+        self.clock = clock
+        self.elapsed_ns = 0
+        self.started_ns = None
         self.time_label = QLabel("00:00:00.00", self)
         self.start_button = QPushButton("Start", self)
         self.stop_button = QPushButton("Stop", self)
         self.reset_button = QPushButton("Reset", self)
+        self.lap_button = QPushButton("Lap", self)
+        self.export_button = QPushButton("Export", self)
+        self.laps = LapRecorder()
+        self.lap_model = LapModel(self.laps, self)
+        self.lap_list = QListView(self)
+        self.stats_label = QLabel("", self)
         self.timer = QTimer(self)
-        self.setWindowIcon(QIcon("profile.jpg"))
+        self.setWindowIcon(app_icon())
         self.initUI()
 
     def initUI(self):
@@ -20,68 +138,155 @@ class Stopwatch(QWidget):
         self.start_button.setShortcut("S")
         self.stop_button.setShortcut("P")
         self.reset_button.setShortcut("R")
+        self.lap_button.setShortcut("L")
 
         vbox = QVBoxLayout()
         vbox.addWidget(self.time_label)
         self.setLayout(vbox)
         
         self.time_label.setAlignment(Qt.AlignCenter)
+        self.time_label.setObjectName("time_label")
+        self.stats_label.setObjectName("stats_label")
+        self.lap_button.setObjectName("lap_button")
+        self.export_button.setObjectName("lap_button")
 
         hbox = QHBoxLayout()
 
         hbox.addWidget(self.start_button)
         hbox.addWidget(self.stop_button)
         hbox.addWidget(self.reset_button)
+        hbox.addWidget(self.lap_button)
 
         vbox.addLayout(hbox)
+
+        # only the rows on screen are ever formatted, so lap count doesn't matter
+        self.lap_list.setModel(self.lap_model)
+        self.lap_list.setUniformItemSizes(True)
+        self.lap_list.setLayoutMode(QListView.Batched)
+        vbox.addWidget(self.lap_list)
+
+        stats_box = QHBoxLayout()
+        stats_box.addWidget(self.stats_label, 1)
+        stats_box.addWidget(self.export_button)
+        vbox.addLayout(stats_box)
         
-        self.setStyleSheet("""
-            QPushButton{
-                font-size: 50px;
-                padding:20px;
-                font-weight:bold;        
-           }
-            QLabel{
-                font-size:120px;
-                background-color:black;
-                color:white;
-                border-radius:10px;
-                padding:20px;
-                font-weight:bold;               
-           }
-""")
+        self.setStyleSheet(theme.stylesheet("stopwatch"))
 
         self.start_button.clicked.connect(self.start)
         self.stop_button.clicked.connect(self.stop)
         self.reset_button.clicked.connect(self.reset)
+        self.lap_button.clicked.connect(self.record_lap)
+        self.export_button.clicked.connect(self.export_laps)
         self.timer.timeout.connect(self.update_display)
 
 
 
+    def is_running(self):
+        return self.started_ns is not None
+
+    def elapsed(self):
+        """Elapsed nanoseconds, measured from the clock rather than counted ticks"""
+        if self.started_ns is None:
+            return self.elapsed_ns
+        return self.elapsed_ns + self.clock() - self.started_ns
+
     def start(self):
-        self.timer.start(10)
+        if self.started_ns is None:
+            self.started_ns = self.clock()
+        self.update_render_timer()
 
     def stop(self):
+        if self.started_ns is not None:
+            self.elapsed_ns = self.elapsed()
+            self.started_ns = None
         self.timer.stop()
+        self.update_display()
 
     def reset(self):
         self.timer.stop()
-        self.time = QTime(0,0,0,0)
-        self.time_label.setText(self.format_time(self.time))
+        self.elapsed_ns = 0
+        self.started_ns = None
+        self.update_display()
+        self.lap_model.clear()
+        self.update_stats()
+
+    def record_lap(self):
+        if not self.is_running():
+            return
+        self.lap_model.add_lap(self.elapsed())
+        self.update_stats()
+
+    def update_stats(self):
+        if not self.laps:
+            self.stats_label.clear()
+            return
+        fmt = self.format_time
+        self.stats_label.setText(
+            f"Laps: {len(self.laps)} | Best: {fmt(self.laps.minimum)} | Worst: {fmt(self.laps.maximum)} | "
+            f"Mean: {fmt(self.laps.mean())} | P50: {fmt(self.laps.percentile(50))} | "
+            f"P90: {fmt(self.laps.percentile(90))}")
+
+    def export_laps(self):
+        if not self.laps:
+            QMessageBox.information(self, "Info", "No laps to export!")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Laps", "laps.csv", "CSV files (*.csv)")
+        if not path:
+            return
+        try:
+            with open(path, "w", newline="") as f:
+                self.laps.write_csv(f)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Could not export laps: {e}")
+
+    def frame_interval(self):
+        """Milliseconds between redraws, matched to the screen refresh rate"""
+        screen = self.screen() if self.isVisible() else QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        if rate <= 0:
+            return MIN_FRAME_MS
+        return max(MIN_FRAME_MS, round(1000 / rate))
+
+    def should_render(self):
+        # window(): inside the launcher only the top-level window is minimized
+        return self.isVisible() and not self.window().isMinimized()
+
+    def update_render_timer(self):
+        """Redraw only while running and visible, the time itself keeps counting"""
+        if self.is_running() and self.should_render():
+            self.timer.start(self.frame_interval())
+        else:
+            self.timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.is_running():
+            self.update_display()
+        self.update_render_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_render_timer()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.is_running():
+                self.update_display()
+            self.update_render_timer()
 
-    def format_time(self, time):
-        hours = time.hour()
-        minutes = time.minute()
-        seconds = time.second()
-        milliseconds = time.msec() // 10
-        return f"{hours:02}:{minutes:02}:{seconds:02}:{milliseconds:02}"
+    def format_time(self, elapsed_ns):
+        return format_time(elapsed_ns)
 
     def update_display(self): 
-        self.time = self.time.addMSecs(10)
-        self.time_label.setText(self.format_time(self.time))
+        text = self.format_time(self.elapsed())
+        if text != self.time_label.text():
+            self.time_label.setText(text)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    stall_watchdog.install(app)
+    theme.engine.apply()
     stopwatch = Stopwatch()
     stopwatch.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,153 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc_engine import ExpressionError, LiveEvaluator, ResultTooLarge, evaluate, format_result
+
+
+def random_number(rng):
+    whole = str(rng.randint(1, 999)) if rng.random() < 0.9 else "0"
+    kind = rng.random()
+    if kind < 0.6:
+        return whole
+    if kind < 0.8:
+        return f"{whole}.{rng.randint(0, 99)}"
+    return f".{rng.randint(1, 99)}"
+
+
+def random_expression(rng, size):
+    parts = []
+    for index in range(size):
+        after_power = parts and parts[-1].endswith("**")
+        if rng.random() < 0.15:
+            parts.append(rng.choice("-+"))
+        if after_power:
+            # keep powers small enough for eval to finish
+            parts.append(str(rng.randint(0, 4)))
+        else:
+            parts.append(random_number(rng))
+        if index < size - 1:
+            operators = ["+", "-", "*", "/", "//"]
+            if not after_power:
+                # no towers of powers, eval would never finish
+                operators.append("**")
+            parts.append(rng.choice(operators))
+    return "".join(parts)
+
+
+def python_result(expression):
+    try:
+        return eval(expression, {"__builtins__": {}})
+    except (ArithmeticError, ValueError):
+        return ExpressionError
+
+
+def engine_result(expression):
+    try:
+        return evaluate(expression)
+    except ExpressionError:
+        return ExpressionError
+
+
+def same(a, b):
+    if a is ExpressionError or b is ExpressionError:
+        return a is b
+    return type(a) is type(b) and (a == b or a != a and b != b)
+
+
+def test_float_mode_matches_eval():
+    rng = random.Random(26)
+    for _ in range(3000):
+        expression = random_expression(rng, rng.randint(1, 8))
+        assert same(engine_result(expression), python_result(expression)), expression
+
+
+def test_value_after_every_push_matches_the_prefix():
+    rng = random.Random(28)
+    for _ in range(300):
+        expression = random_expression(rng, rng.randint(1, 6))
+        evaluator = LiveEvaluator()
+        for length in range(1, len(expression) + 1):
+            evaluator.push(expression[length - 1])
+            prefix = expression[:length]
+            try:
+                expected = evaluate(prefix)
+            except ExpressionError:
+                expected = None
+            value = evaluator.value()
+            if expected is None:
+                assert value is None, prefix
+            else:
+                assert same(value, expected), prefix
+                # a complete prefix is an ordinary Python expression too
+                assert same(value, python_result(prefix)), prefix
+
+
+def test_exact_modes():
+    assert evaluate("0.1+0.2") == 0.30000000000000004
+    assert evaluate("0.1+0.2", "decimal") == Decimal("0.3")
+    assert evaluate("0.1+0.2", "fraction") == Fraction(3, 10)
+    assert evaluate("1/3", "fraction") == Fraction(1, 3)
+    assert evaluate("2**-2", "fraction") == Fraction(1, 4)
+    assert evaluate("1/3", "decimal", precision=5) == Decimal("0.33333")
+
+
+def test_integer_mode():
+    assert evaluate("7/2", "integer") == 3
+    assert evaluate("-7/2", "integer") == -4
+    assert evaluate("2**100", "integer") == 2 ** 100
+    with pytest.raises(ExpressionError):
+        evaluate("2**-1", "integer")
+    with pytest.raises(ExpressionError):
+        evaluate("1.5", "integer")
+
+
+@pytest.mark.parametrize("mode", ["float", "fraction", "integer"])
+def test_huge_powers_are_refused(mode):
+    with pytest.raises(ResultTooLarge):
+        evaluate("9**9**9", mode)
+    with pytest.raises(ResultTooLarge):
+        evaluate("3**300000", mode)
+
+
+def test_decimal_mode_rounds_huge_powers():
+    assert evaluate("3**300000", "decimal", precision=5) == Decimal("2.3791E+143136")
+
+
+def test_digit_limit_is_exact():
+    # 3**209590 has exactly 100000 digits, one more power has 100001
+    assert evaluate("3**209590", "integer") == 3 ** 209590
+    with pytest.raises(ResultTooLarge):
+        evaluate("3**209591", "integer")
+    with pytest.raises(ResultTooLarge):
+        evaluate("10**100", max_digits=100)
+    assert evaluate("10**99", max_digits=100) == 10 ** 99
+
+
+def test_set_mode_keeps_a_huge_loaded_result():
+    evaluator = LiveEvaluator()
+    evaluator.extend("7**20000")
+    value = evaluator.result()
+    evaluator.load(value)
+    assert evaluator.tail(20).startswith("≈")
+
+    evaluator.set_mode("fraction")
+    assert evaluator.result() == value
+    evaluator.extend("+1")
+    assert evaluator.result() == value + 1
+
+
+def test_set_mode_evaluates_the_text_again():
+    evaluator = LiveEvaluator()
+    evaluator.extend("0.1+0.2")
+    evaluator.set_mode("fraction")
+    assert evaluator.result() == Fraction(3, 10)
+
+
+def test_format_result_never_writes_out_huge_numbers():
+    assert format_result(12345) == "12345"
+    assert format_result(7 ** 20000) == "≈9.1369297356e+16901"
+    assert format_result(-(7 ** 20000)) == "≈-9.1369297356e+16901"
+    assert format_result(Fraction(1, 3)) == "1/3"
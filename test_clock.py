@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTime, Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+from clock import TICK_SLACK_MS, DigitalClock, WorldClock
+
+# how late a tick may be on a busy test machine
+JITTER_MS = 100
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def clock(app):
+    clock = DigitalClock()
+    yield clock
+    clock.close()
+    clock.deleteLater()
+
+
+def test_ticks_once_a_second_just_after_the_boundary(clock):
+    tick_msecs = []
+    clock.timer.timeout.connect(lambda: tick_msecs.append(QTime.currentTime().msec()))
+    clock.show()
+    QTest.qWait(3500)
+
+    assert 3 <= clock.wakeups <= 4
+    assert len(tick_msecs) == clock.wakeups
+    for msec in tick_msecs:
+        assert msec < TICK_SLACK_MS + JITTER_MS
+    assert clock.time_label.text() == QTime.currentTime().toString("hh:mm:ss AP")
+
+
+def test_no_wakeups_while_hidden(clock):
+    clock.show()
+    clock.hide()
+    wakeups = clock.wakeups
+    QTest.qWait(2500)
+    assert clock.wakeups == wakeups
+    assert not clock.timer.isActive()
+
+
+def test_no_wakeups_while_minimized(clock):
+    clock.show()
+    clock.setWindowState(Qt.WindowMinimized)
+    wakeups = clock.wakeups
+    QTest.qWait(2500)
+    assert clock.wakeups == wakeups
+
+    clock.setWindowState(Qt.WindowNoState)
+    QTest.qWait(1500)
+    assert clock.wakeups > wakeups
+
+
+def test_no_wakeups_while_the_hosting_window_is_minimized(app):
+    # as a launcher tab, the clock is a child and never minimized itself
+    window = QWidget()
+    clock = DigitalClock()
+    QVBoxLayout(window).addWidget(clock)
+    try:
+        window.show()
+        QTest.qWait(1200)
+        assert clock.wakeups > 0
+
+        window.setWindowState(Qt.WindowMinimized)
+        wakeups = clock.wakeups
+        QTest.qWait(2500)
+        assert clock.wakeups == wakeups
+
+        window.setWindowState(Qt.WindowNoState)
+        QTest.qWait(1500)
+        assert clock.wakeups > wakeups
+    finally:
+        window.close()
+        window.deleteLater()
+
+
+def test_world_clock_rows_filled_at_once(app):
+    clock = WorldClock(["UTC", "Not/A_Zone", "Asia/Tokyo"])
+    try:
+        assert [row.zone_id for row in clock.rows] == ["UTC", "Asia/Tokyo"]
+        for row in clock.rows:
+            assert row.time_label.text()
+            assert row.day_label.text()
+            assert row.name_label.text() != row.zone_id
+        # no labels left behind for the unknown zone
+        zones = clock.rows[0].name_label.parentWidget()
+        assert len(zones.findChildren(type(clock.time_label))) == 3 * len(clock.rows)
+    finally:
+        clock.deleteLater()
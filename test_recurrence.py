@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pytest
+
+import recurrence
+
+
+def test_monthly_end_of_month_is_clamped():
+    rule = {'due_date': "2024-01-31", 'repeat': "monthly"}
+    assert list(recurrence.occurrences(rule, end=date(2024, 5, 31))) == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31)]
+    # the day is taken from the first date, not the previous occurrence
+    assert recurrence.occurrence(date(2023, 1, 31), "monthly", 1) == date(2023, 2, 28)
+    assert recurrence.occurrence(date(2023, 1, 31), "monthly", 2) == date(2023, 3, 31)
+
+
+@pytest.mark.parametrize("repeat", recurrence.REPEATS)
+@pytest.mark.parametrize("first", [date(2024, 1, 31), date(2024, 2, 29), date(2023, 12, 15)])
+def test_first_index_matches_brute_force(repeat, first):
+    for offset in range(-5, 800, 3):
+        day = first + timedelta(days=offset)
+        n = 0
+        while recurrence.occurrence(first, repeat, n) < day:
+            n += 1
+        assert recurrence.first_index(first, repeat, day) == n, day
+
+
+def test_window_is_generated_lazily():
+    rule = {'due_date': "2000-01-01", 'repeat': "daily"}
+    window = list(recurrence.occurrences(rule, date(2026, 10, 19), date(2026, 10, 21)))
+    assert window == [date(2026, 10, 19), date(2026, 10, 20), date(2026, 10, 21)]
+
+
+def test_completing_in_order_only_moves_done_through():
+    rule = {'due_date': "2020-01-01", 'repeat': "daily", 'done': []}
+    for _ in range(2000):
+        recurrence.complete(rule, recurrence.next_open(rule))
+    assert rule['done_through'] == "2025-06-22"
+    assert rule['done'] == []
+    assert recurrence.due_date(rule) == "2025-06-23"
+
+
+def test_completing_out_of_order_keeps_exceptions_until_folded():
+    rule = {'due_date': "2026-10-01", 'repeat': "daily", 'done': []}
+    recurrence.complete(rule, date(2026, 10, 3))
+    recurrence.complete(rule, date(2026, 10, 2))
+    assert rule['done'] == ["2026-10-02", "2026-10-03"]
+    assert 'done_through' not in rule
+    assert recurrence.due_date(rule) == "2026-10-01"
+    assert list(recurrence.open_occurrences(rule, end=date(2026, 10, 5))) == [
+        date(2026, 10, 1), date(2026, 10, 4), date(2026, 10, 5)]
+
+    recurrence.complete(rule, date(2026, 10, 1))
+    assert rule['done_through'] == "2026-10-03"
+    assert rule['done'] == []
+
+
+def test_restart_forgets_completions():
+    rule = {'due_date': "2026-10-01", 'repeat': "weekly", 'done': []}
+    recurrence.complete(rule, date(2026, 10, 1))
+    recurrence.complete(rule, date(2026, 10, 15))
+    recurrence.restart(rule, "2026-11-02")
+    assert recurrence.due_date(rule) == "2026-11-02"
+    assert 'done_through' not in rule and rule['done'] == []
@@ -0,0 +1,47 @@
+import logging
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from stall_watchdog import StallWatchdog
+
+
+@pytest.fixture
+def watchdog():
+    app = QApplication.instance() or QApplication([])
+    watchdog = StallWatchdog(threshold_ms=100, parent=app)
+    watchdog.start()
+    yield watchdog
+    watchdog.stop()
+
+
+def stuck_handler():
+    time.sleep(0.3)
+
+
+def test_stall_is_reported_with_its_stack(watchdog, caplog):
+    caplog.set_level(logging.WARNING, logger="stall_watchdog")
+    QTimer.singleShot(0, stuck_handler)
+    QTest.qWait(600)
+
+    assert watchdog.stall_count == 1
+    assert watchdog.max_stall >= 0.3
+    assert "stuck_handler" in caplog.text
+
+
+def test_idle_loop_is_not_woken(watchdog):
+    loop = QEventLoop()
+    QTimer.singleShot(1000, loop.quit)
+    loop.exec_()
+    # a second of idle loop wakes up for the quit timer and little else,
+    # the watchdog itself posts nothing
+    assert watchdog.stall_count == 0
+    assert watchdog.busy_periods < 10
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from stopwatch import Stopwatch
+
+SECOND = 1_000_000_000
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 5 * SECOND
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def stopwatch(app):
+    clock = FakeClock()
+    stopwatch = Stopwatch(clock)
+    yield stopwatch, clock
+    stopwatch.deleteLater()
+
+
+def test_no_drift_after_stalls(stopwatch):
+    stopwatch, clock = stopwatch
+    stopwatch.start()
+    # the event loop never runs in between, as if the GUI thread were stuck
+    for stall in (3 * SECOND, 45_678_900_000, 7 * 3600 * SECOND + 123_456_789):
+        clock.now += stall
+
+    assert stopwatch.elapsed() == 7 * 3600 * SECOND + 48_802_356_789
+    stopwatch.update_display()
+    assert stopwatch.time_label.text() == "07:00:48:80"
+
+
+def test_stopped_time_does_not_count(stopwatch):
+    stopwatch, clock = stopwatch
+    stopwatch.start()
+    clock.now += 90 * SECOND
+    stopwatch.stop()
+    clock.now += 3600 * SECOND
+    stopwatch.start()
+    clock.now += 1_500_000_000
+    stopwatch.stop()
+
+    assert stopwatch.elapsed() == 91_500_000_000
+    assert stopwatch.time_label.text() == "00:01:31:50"
+
+    stopwatch.reset()
+    assert stopwatch.elapsed() == 0
+    assert stopwatch.time_label.text() == "00:00:00:00"
+
+
+def test_laps_newest_first(stopwatch):
+    stopwatch, clock = stopwatch
+    stopwatch.start()
+    for lap in (2 * SECOND, 3 * SECOND):
+        clock.now += lap
+        stopwatch.record_lap()
+
+    model = stopwatch.lap_model
+    assert model.rowCount() == 2
+    assert model.data(model.index(0)) == "Lap      2    00:00:03:00    00:00:05:00"
+    assert model.data(model.index(1)) == "Lap      1    00:00:02:00    00:00:02:00"
+
+    stopwatch.reset()
+    assert model.rowCount() == 0
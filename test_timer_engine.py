@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from timer_engine import AlarmTimer, CountdownTimer, Scheduler
+
+SECOND = 1_000_000_000
+
+
+class FakeClocks:
+    """A monotonic clock and a wall clock that move together"""
+
+    def __init__(self):
+        self.ns = 0
+        self.wall = datetime(2026, 1, 1, 12, 0, 0)
+
+    def monotonic(self):
+        return self.ns
+
+    def now(self):
+        return self.wall
+
+    def advance(self, seconds):
+        self.ns += int(seconds * SECOND)
+        self.wall += timedelta(seconds=seconds)
+
+
+def test_countdown_rings_once():
+    clocks = FakeClocks()
+    scheduler = Scheduler(clocks.monotonic)
+    rung = []
+    timer = CountdownTimer(scheduler, "tea", 5 * SECOND, rung.append)
+    timer.start()
+    clocks.advance(4.9)
+    scheduler.run_due()
+    assert not rung
+    clocks.advance(0.1)
+    scheduler.run_due()
+    assert rung == [timer]
+    assert timer.status() == "Done"
+
+
+def test_alarm_rearmed_rings_at_its_time():
+    clocks = FakeClocks()
+    scheduler = Scheduler(clocks.monotonic)
+    rung = []
+    at = clocks.wall + timedelta(seconds=10)
+    alarm = AlarmTimer(scheduler, "alarm", at, lambda timer: rung.append(clocks.now()), clocks.now)
+
+    alarm.start()
+    clocks.advance(3)
+    alarm.stop()
+    clocks.advance(5)
+    alarm.start()
+    assert alarm.status() == "At 12:00:10"
+
+    clocks.advance(1.9)
+    scheduler.run_due()
+    assert not rung
+    clocks.advance(0.1)
+    scheduler.run_due()
+    assert rung == [at]
+
+
+def test_alarm_reset_uses_the_current_time():
+    clocks = FakeClocks()
+    scheduler = Scheduler(clocks.monotonic)
+    alarm = AlarmTimer(scheduler, "alarm", clocks.wall + timedelta(seconds=10), now=clocks.now)
+    clocks.advance(4)
+    alarm.reset()
+    alarm.start()
+    assert alarm.remaining() == 6 * SECOND
+
+
+def test_cancelling_many_from_a_callback_keeps_periodic_timers_on_time():
+    clocks = FakeClocks()
+    scheduler = Scheduler(clocks.monotonic)
+    fired = []
+    others = [scheduler.call_later(1000, lambda: None) for _ in range(100)]
+
+    def cancel_others():
+        for handle in others:
+            scheduler.cancel(handle)
+
+    # due together with the first period and run just before it
+    scheduler.call_later(100, cancel_others)
+    scheduler.call_every(100, lambda: fired.append(clocks.ns))
+    for now in range(10, 1000, 10):
+        clocks.ns = now
+        scheduler.run_due()
+
+    assert fired == list(range(100, 1000, 100))
+    # every entry but the periodic timer is a cancelled one
+    assert scheduler.cancelled == len(scheduler.heap) - 1
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QDate, Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from launcher import load_module
+
+
+@pytest.fixture
+def todo(tmp_path, monkeypatch):
+    QApplication.instance() or QApplication([])
+    # the app saves next to where it runs
+    monkeypatch.chdir(tmp_path)
+    app = load_module("todo PYQT5.py").TodoApp()
+    yield app
+    app.close()
+    app.deleteLater()
+
+
+def add(todo, text, due):
+    todo.task_input.setText(text)
+    todo.due_date.setDate(QDate.fromString(due, "yyyy-MM-dd"))
+    todo.add_task()
+
+
+def row_texts(todo):
+    return [todo.task_list.itemWidget(todo.task_list.item(row)).text
+            for row in range(todo.task_list.count())]
+
+
+def test_delete_works_after_editing(todo):
+    add(todo, "first", "2026-01-01")
+    widget = todo.task_list.itemWidget(todo.task_list.item(0))
+    QTest.mouseClick(widget.edit_btn, Qt.LeftButton)
+    QTest.mouseClick(widget.delete_btn, Qt.LeftButton)  # Cancel
+    QTest.mouseClick(widget.delete_btn, Qt.LeftButton)  # Delete
+    assert todo.tasks == []
+    assert todo.task_list.count() == 0
+
+
+def test_rescheduling_moves_only_the_row(todo):
+    todo.sort_combo.setCurrentText("Due date")
+    add(todo, "b", "2026-02-01")
+    add(todo, "a", "2026-01-01")
+    add(todo, "c", "2026-03-01")
+    assert row_texts(todo) == ["a", "b", "c"]
+
+    task_id = todo.tasks[0]['id']
+    todo.reschedule_task(task_id, "2026-04-01")
+    assert row_texts(todo) == ["a", "c", "b"]
+    assert todo.order == sorted(todo.order)
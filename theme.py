@@ -0,0 +1,325 @@
+"""Light/dark themes and the style sheets of every tool, in one place.
+
+Theme colors live in a QPalette per theme, built once and cached, and the
+style sheets only describe what doesn't change between themes: sizes,
+fonts, shapes and accent colors. Each sheet is set once when its window is
+built, so switching themes is a single QApplication.setPalette call and no
+style sheet is ever parsed again.
+
+    import theme
+    theme.engine.apply("dark")
+    widget.setStyleSheet(theme.stylesheet("calculator"))
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QApplication
+
+THEMES = {
+    "light": {
+        QPalette.Window: "#f5f5f5",
+        QPalette.WindowText: "#333333",
+        QPalette.Base: "#ffffff",
+        QPalette.AlternateBase: "#f9f9f9",
+        QPalette.Text: "#333333",
+        QPalette.Button: "#e0e0e0",
+        QPalette.ButtonText: "#333333",
+        QPalette.Mid: "#cccccc",
+        QPalette.Highlight: "#2196f3",
+        QPalette.HighlightedText: "#ffffff",
+        QPalette.ToolTipBase: "#ffffff",
+        QPalette.ToolTipText: "#333333",
+        QPalette.PlaceholderText: "#888888",
+    },
+    "dark": {
+        QPalette.Window: "#2b2b2b",
+        QPalette.WindowText: "#ffffff",
+        QPalette.Base: "#3c3f41",
+        QPalette.AlternateBase: "#323232",
+        QPalette.Text: "#ffffff",
+        QPalette.Button: "#555555",
+        QPalette.ButtonText: "#ffffff",
+        QPalette.Mid: "#555555",
+        QPalette.Highlight: "#2196f3",
+        QPalette.HighlightedText: "#ffffff",
+        QPalette.ToolTipBase: "#3c3f41",
+        QPalette.ToolTipText: "#ffffff",
+        QPalette.PlaceholderText: "#999999",
+    },
+}
+
+STYLESHEETS = {
+    "calculator": """
+                QPushButton {
+                    font-size: 20px;
+                    background-color: hsl(308, 100%, 76.3%);
+                    color: white;
+                    padding: 5px;
+                    border-radius: 10px;
+                }
+                QPushButton:hover {
+                    background-color: hsl(308, 100%, 65.3%);
+                }
+                QPushButton:pressed {
+                    background-color: hsl(308, 100%, 25.3%);
+                }
+                QLabel {
+                    font-size: 24px;
+                    padding: 10px;
+                    background-color: white;
+                    color: black;
+                    border: 5px double black;
+                }
+                QLabel#preview {
+                    font-size: 16px;
+                    padding: 2px 10px;
+                    background-color: transparent;
+                    color: gray;
+                    border: none;
+                }
+    """,
+    "clock": """
+            QWidget{
+                background-color:black;
+            }
+            QLabel#time_label{
+                font-size:150px;
+                font-family:courier new;
+                color:Yellow;
+            }
+    """,
+    "world_clock": """
+            QWidget{
+                background-color:black;
+            }
+            QLabel{
+                font-size:24px;
+                font-family:courier new;
+                color:Yellow;
+            }
+            QLabel#time_label{
+                font-size:80px;
+            }
+    """,
+    "stopwatch": """
+            QPushButton{
+                font-size: 50px;
+                padding:20px;
+                font-weight:bold;
+           }
+            QPushButton#lap_button{
+                font-size: 20px;
+                padding:10px;
+           }
+            QLabel#stats_label{
+                font-size: 16px;
+           }
+            QListView{
+                font-family:courier new;
+                font-size: 18px;
+           }
+            QLabel#time_label{
+                font-size:120px;
+                background-color:black;
+                color:white;
+                border-radius:10px;
+                padding:20px;
+                font-weight:bold;
+           }
+    """,
+    "weather": """
+                            QLabel, QPushButton{
+                                font-family:courier new;
+                                }
+                            QLabel#city_label{
+                                        font-size:40px;
+                                        font-style:italic;
+                            }
+                           QLineEdit#city_input{
+                           font-size:40px;
+                           }
+                            QPushButton#weather_button{
+                           font-size:30px;
+                           font-weight:bold;
+                           }
+                           QLabel#temperature_label{
+                           font-size:75px;
+                           }
+                           QLabel#temperature_label[state="weather"]{
+                           font-size:60px;
+                           }
+                           QLabel#temperature_label[state="error"]{
+                           font-size:30px;
+                           }
+                           QLabel#emoji_label{
+                           font-size:75px;
+                           font-family:Segeo UI emoji;
+                           color:orange;
+                           }
+                           QLabel#description{
+                           font-size:75px;
+                           }
+    """,
+    "timers": """
+            QPushButton{
+                font-size: 16px;
+                padding: 8px;
+                font-weight: bold;
+            }
+            QListView{
+                font-family: courier new;
+                font-size: 18px;
+            }
+    """,
+    "todo": """
+            QLabel#title {
+                font-size: 24px;
+                font-weight: bold;
+                color: #2196F3;
+                padding: 10px;
+            }
+            QPushButton#theme_btn {
+                background-color: #666;
+                color: white;
+                border: none;
+                padding: 8px 15px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton#theme_btn:hover {
+                background-color: #555;
+            }
+            QPushButton#add_btn {
+                background-color: #4CAF50;
+                color: white;
+                border: none;
+                padding: 8px 15px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton#add_btn:hover {
+                background-color: #45a049;
+            }
+            QPushButton#clear_btn {
+                background-color: #ff9800;
+                color: white;
+                border: none;
+                padding: 8px 15px;
+                border-radius: 5px;
+            }
+            QPushButton#clear_btn:hover {
+                background-color: #f57c00;
+            }
+            QListWidget {
+                border: 1px solid rgba(128, 128, 128, 110);
+                border-radius: 5px;
+                padding: 5px;
+            }
+            QListWidget::item {
+                border-bottom: 1px solid rgba(128, 128, 128, 60);
+            }
+            QLineEdit, QComboBox, QDateEdit {
+                border: 1px solid rgba(128, 128, 128, 140);
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QLabel#task_text {
+                padding: 5px;
+                border-radius: 3px;
+            }
+            QLabel#task_text[completed="true"] {
+                color: #888;
+                text-decoration: line-through;
+            }
+            QLabel#due {
+                color: #888;
+                font-size: 10px;
+            }
+            QLabel#category {
+                background-color: #e3f2fd;
+                color: #1976d2;
+                padding: 2px 8px;
+                border-radius: 10px;
+                font-size: 10px;
+            }
+            QLabel#category[completed="true"] {
+                background-color: #c8e6c9;
+                color: #2e7d32;
+            }
+            QPushButton#edit_btn {
+                background-color: #ff9800;
+                color: white;
+                border: none;
+                padding: 5px 10px;
+                border-radius: 3px;
+            }
+            QPushButton#edit_btn:hover {
+                background-color: #f57c00;
+            }
+            QPushButton#delete_btn {
+                background-color: #f44336;
+                color: white;
+                border: none;
+                padding: 5px 10px;
+                border-radius: 3px;
+            }
+            QPushButton#delete_btn:hover {
+                background-color: #d32f2f;
+            }
+    """,
+}
+
+
+def stylesheet(name):
+    """The style sheet of one tool"""
+    return STYLESHEETS[name]
+
+
+def repolish(widget):
+    """Re-apply style sheet rules after a dynamic property of `widget` changed"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+class ThemeEngine(QObject):
+    """Switches the application between the THEMES palettes"""
+
+    changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.current = None
+        self.palettes = {}
+
+    def palette(self, name):
+        """The QPalette of a theme, built the first time it is asked for"""
+        if name not in self.palettes:
+            palette = QPalette()
+            for role, color in THEMES[name].items():
+                palette.setColor(role, QColor(color))
+            self.palettes[name] = palette
+        return self.palettes[name]
+
+    def apply(self, name=None, app=None):
+        """Switch to theme `name`, or set up the current one if not given"""
+        app = app or QApplication.instance()
+        name = name or self.current or "light"
+        if self.current is None:
+            # Fusion draws with the palette on every platform
+            app.setStyle("Fusion")
+        elif name == self.current:
+            return
+        app.setPalette(self.palette(name))
+        self.current = name
+        self.changed.emit(name)
+
+    def toggle(self):
+        self.apply("dark" if self.current == "light" else "light")
+
+    @property
+    def dark(self):
+        return self.current == "dark"
+
+
+engine = ThemeEngine()
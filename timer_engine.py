@@ -0,0 +1,254 @@
+"""One wakeup source for any number of stopwatches, countdowns and alarms.
+
+Deadlines live in a heap, so scheduling and cancelling are O(log n) and
+the only thing that ever wakes up is a single-shot QTimer armed for the
+earliest deadline. Stopwatches don't need deadlines at all: their time is
+read from the clock whenever it is shown.
+"""
+
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+NS_PER_MS = 1_000_000
+
+
+class TimerHandle:
+    """A scheduled callback, returned by Scheduler.call_at"""
+
+    def __init__(self, deadline, callback, interval=None):
+        self.deadline = deadline
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+
+
+class Scheduler:
+    """A heap of deadlines on a monotonic nanosecond clock"""
+
+    def __init__(self, clock=time.monotonic_ns):
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()
+        self.cancelled = 0
+
+    def call_at(self, deadline, callback, interval=None):
+        """Run `callback` at `deadline`, then every `interval` ns if given"""
+        handle = TimerHandle(deadline, callback, interval)
+        self._push(handle)
+        return handle
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_every(self, interval, callback):
+        return self.call_at(self.clock() + interval, callback, interval)
+
+    def cancel(self, handle):
+        """Cancel a callback; it is dropped lazily when it reaches the top"""
+        if handle is None or handle.cancelled:
+            return
+        handle.cancelled = True
+        self.cancelled += 1
+        # rebuild when mostly garbage so the heap stays proportional to live timers;
+        # in place, since run_due may be walking this same list
+        if self.cancelled > 64 and self.cancelled * 2 > len(self.heap):
+            self.heap[:] = [entry for entry in self.heap if not entry[2].cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
+
+    def next_deadline(self):
+        """The earliest pending deadline, or None when nothing is scheduled"""
+        heap = self.heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self.cancelled -= 1
+        return heap[0][0] if heap else None
+
+    def run_due(self, now=None):
+        """Run every callback whose deadline has passed, returns how many ran"""
+        if now is None:
+            now = self.clock()
+        ran = 0
+        heap = self.heap
+        # callbacks may schedule and cancel, which changes `heap` as we go
+        while heap and heap[0][0] <= now:
+            _, _, handle = heapq.heappop(heap)
+            if handle.cancelled:
+                self.cancelled -= 1
+                continue
+            if handle.interval:
+                # stay on the original grid and skip periods that were missed
+                missed = (now - handle.deadline) // handle.interval
+                handle.deadline += (missed + 1) * handle.interval
+                self._push(handle)
+            else:
+                handle.cancelled = True
+            handle.callback()
+            ran += 1
+        return ran
+
+    def _push(self, handle):
+        heapq.heappush(self.heap, (handle.deadline, next(self.counter), handle))
+
+
+class QtScheduler(Scheduler):
+    """Scheduler driven by one single-shot QTimer"""
+
+    def __init__(self, parent=None, clock=time.monotonic_ns):
+        from PyQt5.QtCore import QTimer, Qt
+
+        super().__init__(clock)
+        self.timer = QTimer(parent)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._wake)
+        self.wakeups = 0
+        self.armed_for = None
+
+    def call_at(self, deadline, callback, interval=None):
+        handle = super().call_at(deadline, callback, interval)
+        if self.armed_for is None or deadline < self.armed_for:
+            self._arm()
+        return handle
+
+    def cancel(self, handle):
+        super().cancel(handle)
+        if handle is not None and handle.deadline == self.armed_for:
+            self._arm()
+
+    def _wake(self):
+        self.wakeups += 1
+        self.armed_for = None
+        self.run_due()
+        self._arm()
+
+    def _arm(self):
+        deadline = self.next_deadline()
+        self.armed_for = deadline
+        if deadline is None:
+            self.timer.stop()
+            return
+        delay = max(0, -(-(deadline - self.clock()) // NS_PER_MS))
+        self.timer.start(delay)
+
+
+class StopwatchTimer:
+    """Counts up, nothing is scheduled"""
+
+    kind = "Stopwatch"
+
+    def __init__(self, scheduler, name):
+        self.scheduler = scheduler
+        self.name = name
+        self.elapsed_ns = 0
+        self.started_ns = None
+
+    @property
+    def running(self):
+        return self.started_ns is not None
+
+    def elapsed(self):
+        if self.started_ns is None:
+            return self.elapsed_ns
+        return self.elapsed_ns + self.scheduler.clock() - self.started_ns
+
+    def start(self):
+        if self.started_ns is None:
+            self.started_ns = self.scheduler.clock()
+
+    def stop(self):
+        if self.started_ns is not None:
+            self.elapsed_ns = self.elapsed()
+            self.started_ns = None
+
+    def reset(self):
+        self.stop()
+        self.elapsed_ns = 0
+
+    def status(self):
+        return "Running" if self.running else "Stopped"
+
+    def shown_ns(self):
+        return self.elapsed()
+
+    def discard(self):
+        self.stop()
+
+
+class CountdownTimer(StopwatchTimer):
+    """Counts down from `duration_ns` and calls `on_done` once at zero"""
+
+    kind = "Countdown"
+
+    def __init__(self, scheduler, name, duration_ns, on_done=None):
+        super().__init__(scheduler, name)
+        self.duration_ns = duration_ns
+        self.on_done = on_done
+        self.handle = None
+        self.done = False
+
+    def remaining(self):
+        return max(0, self.duration_ns - self.elapsed())
+
+    def start(self):
+        if self.running or self.done:
+            return
+        super().start()
+        self.handle = self.scheduler.call_later(self.remaining(), self._finish)
+
+    def stop(self):
+        self.scheduler.cancel(self.handle)
+        self.handle = None
+        super().stop()
+
+    def reset(self):
+        super().reset()
+        self.done = False
+
+    def _finish(self):
+        self.handle = None
+        super().stop()
+        self.elapsed_ns = self.duration_ns
+        self.done = True
+        if self.on_done is not None:
+            self.on_done(self)
+
+    def status(self):
+        return "Done" if self.done else super().status()
+
+    def shown_ns(self):
+        return self.remaining()
+
+
+class AlarmTimer(CountdownTimer):
+    """Rings at a wall clock time
+
+    The wait is converted to the monotonic clock each time the alarm is
+    armed, so it is not affected by clock adjustments while waiting and
+    stopping and starting again still rings at `at`.
+    """
+
+    kind = "Alarm"
+
+    def __init__(self, scheduler, name, at, on_done=None, now=datetime.now):
+        super().__init__(scheduler, name, self._wait(at, now), on_done)
+        self.at = at
+        self.now = now
+
+    @staticmethod
+    def _wait(at, now):
+        return max(0, int((at - now()).total_seconds() * 1e9))
+
+    def start(self):
+        if self.running or self.done:
+            return
+        self.duration_ns = self._wait(self.at, self.now)
+        self.elapsed_ns = 0
+        super().start()
+
+    def status(self):
+        if self.done:
+            return "Ringing"
+        return f"At {self.at:%H:%M:%S}" if self.running else "Off"
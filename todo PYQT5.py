@@ -1,13 +1,44 @@
 import sys
 import json
 import os
+from bisect import bisect_left
 from datetime import datetime
+from itertools import islice
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QListWidget, QListWidgetItem, QLineEdit, 
                              QPushButton, QLabel, QMessageBox, QComboBox, 
                              QDateEdit, QCheckBox, QSplitter, QFrame)
-from PyQt5.QtCore import Qt, QDate, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor
+from PyQt5.QtCore import Qt, QDate, QTimer, pyqtSignal
+from PyQt5.QtGui import QPalette, QColor
+from resources import app_font
+import recurrence
+import theme
+import stall_watchdog
+
+# changes made within this many milliseconds are saved together
+SAVE_DELAY_MS = 500
+
+
+# Sort orders of the task list. Every key ends with the creation time and
+# id, so no two tasks compare equal and a task's row is found by bisection.
+def created_key(task):
+    return (task.get('created_at', ''), int(task['id']))
+
+
+def due_date_key(task):
+    # tasks without a due date go last, recurring ones sort by their next
+    return (recurrence.due_date(task) or "9999-12-31",) + created_key(task)
+
+
+def category_key(task):
+    return (task['category'],) + created_key(task)
+
+
+SORT_ORDERS = {
+    "Created": created_key,
+    "Due date": due_date_key,
+    "Category": category_key,
+}
 
 
 class TaskItemWidget(QWidget):
@@ -15,16 +46,19 @@ class TaskItemWidget(QWidget):
     
     taskEdited = pyqtSignal(str, str)  # task_id, new_text
     taskToggled = pyqtSignal(str, bool)  # task_id, completed
+    taskRescheduled = pyqtSignal(str, str)  # task_id, new due date
+    taskDeleted = pyqtSignal(str)  # task_id
     
-    def __init__(self, task_id, text, completed=False, category="Personal", due_date=None):
+    def __init__(self, task_id, text, completed=False, category="Personal", due_date=None, repeat=None):
         super().__init__()
         self.task_id = task_id
         self.text = text
         self.completed = completed
         self.category = category
+        self.due_date = due_date
+        self.repeat = repeat
         
         self.setup_ui()
-        self.update_appearance()
         
     def setup_ui(self):
         """Initialize the UI components for the task item"""
@@ -40,96 +74,49 @@ class TaskItemWidget(QWidget):
         # Task text display
         self.text_label = QLabel(self.text)
         self.text_label.setWordWrap(True)
-        self.text_label.setStyleSheet("padding: 5px;")
+        self.text_label.setObjectName("task_text")
+        # set before the first polish, so new rows are styled only once
+        self.text_label.setProperty("completed", self.completed)
         layout.addWidget(self.text_label, 1)  # 1 = stretch factor
         
+        # Due date
+        self.due_label = QLabel(self.due_text())
+        self.due_label.setObjectName("due")
+        layout.addWidget(self.due_label)
+        
         # Category badge
         self.category_label = QLabel(self.category)
-        self.category_label.setStyleSheet("""
-            QLabel {
-                background-color: #e3f2fd;
-                color: #1976d2;
-                padding: 2px 8px;
-                border-radius: 10px;
-                font-size: 10px;
-            }
-        """)
+        self.category_label.setObjectName("category")
+        self.category_label.setProperty("completed", self.completed)
         layout.addWidget(self.category_label)
         
         # Edit button
         self.edit_btn = QPushButton("Edit")
-        self.edit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff9800;
-                color: white;
-                border: none;
-                padding: 5px 10px;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background-color: #f57c00;
-            }
-        """)
+        self.edit_btn.setObjectName("edit_btn")
         self.edit_btn.clicked.connect(self.start_editing)
         layout.addWidget(self.edit_btn)
         
         # Delete button
         self.delete_btn = QPushButton("Delete")
-        self.delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 5px 10px;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        self.delete_btn.setObjectName("delete_btn")
+        self.delete_btn.clicked.connect(self.on_delete_clicked)
         layout.addWidget(self.delete_btn)
         
         self.setLayout(layout)
         
+    def due_text(self):
+        if self.repeat:
+            return f"{self.due_date} ({self.repeat})"
+        return self.due_date or ""
+        
     def update_appearance(self):
         """Update visual style based on completion status"""
-        if self.completed:
-            self.text_label.setStyleSheet("""
-                QLabel {
-                    color: #888;
-                    text-decoration: line-through;
-                    padding: 5px;
-                    background-color: #e8f5e8;
-                    border-radius: 3px;
-                }
-            """)
-            self.category_label.setStyleSheet("""
-                QLabel {
-                    background-color: #c8e6c9;
-                    color: #2e7d32;
-                    padding: 2px 8px;
-                    border-radius: 10px;
-                    font-size: 10px;
-                }
-            """)
-        else:
-            self.text_label.setStyleSheet("""
-                QLabel {
-                    color: #333;
-                    padding: 5px;
-                    background-color: white;
-                    border-radius: 3px;
-                }
-            """)
-            self.category_label.setStyleSheet("""
-                QLabel {
-                    background-color: #e3f2fd;
-                    color: #1976d2;
-                    padding: 2px 8px;
-                    border-radius: 10px;
-                    font-size: 10px;
-                }
-            """)
+        # the colors come from the window's style sheet, only the two
+        # labels whose property changed need to be polished again
+        for label in (self.text_label, self.category_label):
+            if label.property("completed") != self.completed:
+                label.setProperty("completed", self.completed)
+                theme.repolish(label)
     
     def on_checkbox_changed(self, state):
         """Handle checkbox state change"""
@@ -137,6 +124,10 @@ class TaskItemWidget(QWidget):
         self.update_appearance()
         self.taskToggled.emit(self.task_id, self.completed)
     
+    def on_delete_clicked(self):
+        """Handle delete button click"""
+        self.taskDeleted.emit(self.task_id)
+    
     def start_editing(self):
         """Switch to edit mode"""
         # Replace label with line edit
@@ -144,9 +135,16 @@ class TaskItemWidget(QWidget):
         self.text_label.deleteLater()
         
         self.edit_input = QLineEdit(old_text)
-        self.edit_input.setStyleSheet("padding: 5px;")
         self.layout().insertWidget(1, self.edit_input, 1)
         
+        # Replace the due date with a date picker
+        self.due_input = QDateEdit()
+        self.due_input.setCalendarPopup(True)
+        due = QDate.fromString(self.due_date or "", "yyyy-MM-dd")
+        self.due_input.setDate(due if due.isValid() else QDate.currentDate())
+        self.due_label.hide()
+        self.layout().insertWidget(2, self.due_input)
+        
         # Change edit button to save button
         self.edit_btn.setText("Save")
         self.edit_btn.clicked.disconnect()
@@ -162,11 +160,18 @@ class TaskItemWidget(QWidget):
     def finish_editing(self):
         """Save edited text"""
         new_text = self.edit_input.text().strip()
+        new_due_date = self.due_input.date().toString("yyyy-MM-dd")
+        rescheduled = new_due_date != self.due_date
         if new_text:
             self.text = new_text
-            self.taskEdited.emit(self.task_id, new_text)
+        self.due_date = new_due_date
         
+        # the row may move once the app hears about it, leave edit mode first
         self.exit_edit_mode()
+        if new_text:
+            self.taskEdited.emit(self.task_id, new_text)
+        if rescheduled:
+            self.taskRescheduled.emit(self.task_id, new_due_date)
     
     def cancel_editing(self):
         """Cancel editing and restore original text"""
@@ -176,10 +181,14 @@ class TaskItemWidget(QWidget):
         """Exit edit mode and restore normal view"""
         # Remove line edit and restore label
         self.edit_input.deleteLater()
+        self.due_input.deleteLater()
+        self.due_label.setText(self.due_text())
+        self.due_label.show()
         
         self.text_label = QLabel(self.text)
         self.text_label.setWordWrap(True)
-        self.text_label.setStyleSheet("padding: 5px;")
+        self.text_label.setObjectName("task_text")
+        self.text_label.setProperty("completed", self.completed)
         self.layout().insertWidget(1, self.text_label, 1)
         
         # Restore buttons
@@ -189,6 +198,7 @@ class TaskItemWidget(QWidget):
         
         self.delete_btn.setText("Delete")
         self.delete_btn.clicked.disconnect()
+        self.delete_btn.clicked.connect(self.on_delete_clicked)
         
         self.update_appearance()
 
@@ -199,13 +209,29 @@ class TodoApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.tasks = []
+        self.tasks_by_id = {}
+        self.completed_count = 0
         self.next_id = 1
+        self.sort_order = "Created"
+        # sort keys of the rows on screen, in row order, and each shown
+        # task's key so its row can be found again after it changed
+        self.order = []
+        self.shown_keys = {}
         self.data_file = "todo_data.json"
         self.dark_mode = False
         
+        # saving rewrites the whole file, so a burst of changes is saved once
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.write_tasks)
+        QApplication.instance().aboutToQuit.connect(self.flush_save)
+        
         self.setup_ui()
+        self.setStyleSheet(theme.stylesheet("todo"))
         self.load_tasks()
-        self.apply_light_theme()  # Start with light theme
+        theme.engine.changed.connect(self.theme_changed)
+        self.theme_changed(theme.engine.current or "light")
         
     def setup_ui(self):
         """Initialize the main UI components"""
@@ -223,33 +249,14 @@ class TodoApp(QMainWindow):
         header_layout = QHBoxLayout()
         
         title_label = QLabel("PyTodo")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2196F3;
-                padding: 10px;
-            }
-        """)
+        title_label.setObjectName("title")
         header_layout.addWidget(title_label)
         
         header_layout.addStretch()
         
         # Theme toggle button
         self.theme_btn = QPushButton("🌙 Dark Mode")
-        self.theme_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #666;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #555;
-            }
-        """)
+        self.theme_btn.setObjectName("theme_btn")
         self.theme_btn.clicked.connect(self.toggle_theme)
         header_layout.addWidget(self.theme_btn)
         
@@ -264,6 +271,13 @@ class TodoApp(QMainWindow):
         self.search_input.textChanged.connect(self.filter_tasks)
         search_layout.addWidget(self.search_input)
         
+        # Sort order
+        search_layout.addWidget(QLabel("Sort:"))
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_ORDERS)
+        self.sort_combo.currentTextChanged.connect(self.change_sort_order)
+        search_layout.addWidget(self.sort_combo)
+        
         main_layout.addLayout(search_layout)
         
         # Task input section
@@ -286,21 +300,14 @@ class TodoApp(QMainWindow):
         input_layout.addWidget(QLabel("Due:"))
         input_layout.addWidget(self.due_date)
         
+        # Repeat
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItems(["Once", "Daily", "Weekly", "Monthly"])
+        input_layout.addWidget(self.repeat_combo)
+        
         # Add task button
         add_btn = QPushButton("Add Task")
-        add_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        add_btn.setObjectName("add_btn")
         add_btn.clicked.connect(self.add_task)
         input_layout.addWidget(add_btn)
         
@@ -322,18 +329,7 @@ class TodoApp(QMainWindow):
         
         # Clear completed button
         clear_completed_btn = QPushButton("Clear Completed")
-        clear_completed_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff9800;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #f57c00;
-            }
-        """)
+        clear_completed_btn.setObjectName("clear_btn")
         clear_completed_btn.clicked.connect(self.clear_completed_tasks)
         footer_layout.addWidget(clear_completed_btn)
         
@@ -354,42 +350,78 @@ class TodoApp(QMainWindow):
             'due_date': self.due_date.date().toString("yyyy-MM-dd"),
             'created_at': datetime.now().isoformat()
         }
+        # a recurring task is stored once as a rule, see recurrence.py
+        repeat = self.repeat_combo.currentText().lower()
+        if repeat in recurrence.REPEATS:
+            task['repeat'] = repeat
+            task['done'] = []
         
         self.tasks.append(task)
+        self.tasks_by_id[task['id']] = task
         self.next_id += 1
         self.task_input.clear()
-        self.refresh_task_list()
+        self.place_task(task)
+        self.update_statistics()
         self.save_tasks()
         
     def edit_task(self, task_id, new_text):
         """Edit an existing task"""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task['text'] = new_text
-                break
+        task = self.tasks_by_id.get(task_id)
+        if task is None:
+            return
+        task['text'] = new_text
+        # the new text may no longer match the search
+        self.place_task(task)
+        self.save_tasks()
+        
+    def reschedule_task(self, task_id, due_date):
+        """Change the due date of a task"""
+        task = self.tasks_by_id.get(task_id)
+        if task is None:
+            return
+        if task.get('repeat'):
+            # the series starts over from the new date
+            recurrence.restart(task, due_date)
+            self.hide_task(task_id)
+        else:
+            task['due_date'] = due_date
+        self.place_task(task)
         self.save_tasks()
         
     def toggle_task_completion(self, task_id, completed):
         """Toggle task completion status"""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task['completed'] = completed
-                break
-        self.refresh_task_list()
+        task = self.tasks_by_id.get(task_id)
+        if task is None:
+            return
+        if task.get('repeat'):
+            # only the occurrence shown is done, the row moves on to the next
+            if completed:
+                recurrence.complete(task, recurrence.next_open(task))
+            self.hide_task(task_id)
+            self.place_task(task)
+        else:
+            # the row's widget already shows the new state
+            if task['completed'] != completed:
+                self.completed_count += 1 if completed else -1
+            task['completed'] = completed
+        self.update_statistics()
         self.save_tasks()
         
     def delete_task(self, task_id):
         """Delete a task from the list"""
-        for i, task in enumerate(self.tasks):
-            if task['id'] == task_id:
-                del self.tasks[i]
-                break
-        self.refresh_task_list()
+        task = self.tasks_by_id.pop(task_id, None)
+        if task is None:
+            return
+        self.tasks.remove(task)
+        if task['completed']:
+            self.completed_count -= 1
+        self.hide_task(task_id)
+        self.update_statistics()
         self.save_tasks()
         
     def clear_completed_tasks(self):
         """Remove all completed tasks"""
-        if not any(task['completed'] for task in self.tasks):
+        if not self.completed_count:
             QMessageBox.information(self, "Info", "No completed tasks to clear!")
             return
             
@@ -399,60 +431,126 @@ class TodoApp(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.tasks = [task for task in self.tasks if not task['completed']]
+            self.tasks_by_id = {task['id']: task for task in self.tasks}
+            self.completed_count = 0
             self.refresh_task_list()
             self.save_tasks()
         
     def refresh_task_list(self):
-        """Refresh the task list display"""
+        """Rebuild the task list display from scratch
+        
+        Only needed when the whole view changes (loading, searching, a new
+        sort order or clearing completed tasks); single tasks are placed
+        with place_task.
+        """
         self.task_list.clear()
         
-        # Filter tasks based on search
-        search_text = self.search_input.text().lower()
-        filtered_tasks = [task for task in self.tasks 
-                         if search_text in task['text'].lower()]
-        
-        for task in filtered_tasks:
-            item = QListWidgetItem(self.task_list)
-            widget = TaskItemWidget(
-                task['id'], 
-                task['text'], 
-                task['completed'],
-                task['category'],
-                task.get('due_date')
-            )
-            
-            # Connect signals
-            widget.taskEdited.connect(self.edit_task)
-            widget.taskToggled.connect(self.toggle_task_completion)
-            widget.delete_btn.clicked.connect(lambda checked=False, tid=task['id']: self.delete_task(tid))
-            
-            item.setSizeHint(widget.sizeHint())
-            self.task_list.addItem(item)
-            self.task_list.setItemWidget(item, widget)
+        # Filter tasks based on search, then sort once
+        key = SORT_ORDERS[self.sort_order]
+        shown = sorted(((key(task), task) for task in self.tasks if self.matches_search(task)),
+                       key=lambda pair: pair[0])
+        
+        self.order = [pair[0] for pair in shown]
+        self.shown_keys = {}
+        for row, (task_key, task) in enumerate(shown):
+            self.shown_keys[task['id']] = task_key
+            self.insert_row(row, task)
         
         self.update_statistics()
         
+    def matches_search(self, task):
+        return self.search_input.text().lower() in task['text'].lower()
+        
+    def place_task(self, task):
+        """Put the row of a new or changed task where it belongs
+        
+        The row is found by bisection in the maintained order and only
+        moves if the task's sort key or search match changed.
+        """
+        old_key = self.shown_keys.get(task['id'])
+        if not self.matches_search(task):
+            self.hide_task(task['id'])
+            return
+        key = SORT_ORDERS[self.sort_order](task)
+        if key == old_key:
+            return
+        self.hide_task(task['id'])
+        row = bisect_left(self.order, key)
+        self.order.insert(row, key)
+        self.shown_keys[task['id']] = key
+        self.insert_row(row, task)
+        
+    def hide_task(self, task_id):
+        """Remove the row of a task, if it is shown"""
+        key = self.shown_keys.pop(task_id, None)
+        if key is None:
+            return
+        row = bisect_left(self.order, key)
+        del self.order[row]
+        self.task_list.takeItem(row)
+        
+    def insert_row(self, row, task):
+        item = QListWidgetItem()
+        self.task_list.insertItem(row, item)
+        widget = TaskItemWidget(
+            task['id'], 
+            task['text'], 
+            task['completed'],
+            task['category'],
+            recurrence.due_date(task),
+            task.get('repeat')
+        )
+        if task.get('repeat'):
+            upcoming = islice(recurrence.open_occurrences(task), 5)
+            widget.due_label.setToolTip("Next: " + ", ".join(day.isoformat() for day in upcoming))
+        
+        # Connect signals
+        widget.taskEdited.connect(self.edit_task)
+        widget.taskRescheduled.connect(self.reschedule_task)
+        widget.taskToggled.connect(self.toggle_task_completion)
+        widget.taskDeleted.connect(self.delete_task)
+        
+        item.setSizeHint(widget.sizeHint())
+        self.task_list.setItemWidget(item, widget)
+        
     def filter_tasks(self):
         """Filter tasks based on search text"""
         self.refresh_task_list()
         
+    def change_sort_order(self, name):
+        """Show the tasks in another order"""
+        self.sort_order = name
+        self.refresh_task_list()
+        self.save_tasks()
+        
     def update_statistics(self):
         """Update the statistics display"""
         total = len(self.tasks)
-        completed = sum(1 for task in self.tasks if task['completed'])
+        completed = self.completed_count
         pending = total - completed
         
         self.stats_label.setText(f"Total: {total} | Completed: {completed} | Pending: {pending}")
         
     def save_tasks(self):
-        """Save tasks to JSON file"""
+        """Save tasks to JSON file shortly, together with any further changes"""
+        self.save_timer.start()
+        
+    def flush_save(self):
+        """Write a pending save now"""
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self.write_tasks()
+            
+    def write_tasks(self):
+        """Write tasks to JSON file"""
         try:
             data = {
                 'tasks': self.tasks,
-                'next_id': self.next_id
+                'next_id': self.next_id,
+                'sort_order': self.sort_order
             }
             with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f)
         except Exception as e:
             print(f"Error saving tasks: {e}")
             
@@ -464,128 +562,52 @@ class TodoApp(QMainWindow):
                     data = json.load(f)
                     self.tasks = data.get('tasks', [])
                     self.next_id = data.get('next_id', 1)
+                    self.sort_order = data.get('sort_order', "Created")
+                if self.sort_order not in SORT_ORDERS:
+                    self.sort_order = "Created"
+                self.tasks_by_id = {task['id']: task for task in self.tasks}
+                self.completed_count = sum(1 for task in self.tasks if task['completed'])
+                self.sort_combo.blockSignals(True)
+                self.sort_combo.setCurrentText(self.sort_order)
+                self.sort_combo.blockSignals(False)
                 self.refresh_task_list()
         except Exception as e:
             print(f"Error loading tasks: {e}")
             
+    def closeEvent(self, event):
+        self.flush_save()
+        super().closeEvent(event)
+            
     def toggle_theme(self):
         """Toggle between light and dark themes"""
-        self.dark_mode = not self.dark_mode
-        
+        theme.engine.toggle()
+
+    def theme_changed(self, name):
+        """Keep the toggle button in sync with the application theme"""
+        self.dark_mode = (name == "dark")
         if self.dark_mode:
-            self.apply_dark_theme()
             self.theme_btn.setText("☀️ Light Mode")
         else:
-            self.apply_light_theme()
             self.theme_btn.setText("🌙 Dark Mode")
             
     def apply_light_theme(self):
         """Apply light theme styling"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QWidget {
-                background-color: #f5f5f5;
-                color: #333333;
-            }
-            QListWidget {
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 5px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                border-bottom: 1px solid #eeeeee;
-            }
-            QListWidget::item:alternate {
-                background-color: #f9f9f9;
-            }
-            QLineEdit {
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: white;
-            }
-            QComboBox {
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: white;
-            }
-            QDateEdit {
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: white;
-            }
-        """)
+        theme.engine.apply("light")
         
     def apply_dark_theme(self):
         """Apply dark theme styling"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-            }
-            QWidget {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QListWidget {
-                background-color: #3c3f41;
-                border: 1px solid #555555;
-                border-radius: 5px;
-                padding: 5px;
-                color: #ffffff;
-            }
-            QListWidget::item {
-                border-bottom: 1px solid #555555;
-            }
-            QListWidget::item:alternate {
-                background-color: #323232;
-            }
-            QLineEdit {
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: #3c3f41;
-                color: #ffffff;
-            }
-            QComboBox {
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: #3c3f41;
-                color: #ffffff;
-            }
-            QDateEdit {
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: #3c3f41;
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #555555;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #666666;
-            }
-        """)
+        theme.engine.apply("dark")
 
 
 def main():
     """Main function to run the application"""
     app = QApplication(sys.argv)
+    stall_watchdog.install(app)
     app.setApplicationName("PyTodo")
     
     # Set application-wide font
-    font = QFont("Segoe UI", 10)
-    app.setFont(font)
+    app.setFont(app_font())
+    theme.engine.apply()
     
     window = TodoApp()
     window.show()
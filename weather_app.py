@@ -1,7 +1,8 @@
 import sys
-import requests
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout
 from PyQt5.QtCore import Qt
+import stall_watchdog
+import theme
 
 class WeatherApp(QWidget):
     def __init__(self):
@@ -43,38 +44,15 @@ class WeatherApp(QWidget):
         self.description.setObjectName("description")
 
 
-        self.setStyleSheet("""
-                            QLabel, QPushButton{
-                                font-family:courier new;             
-                                }
-                            QLabel#city_label{
-                                        font-size:40px;
-                                        font-style:italic;               
-                            }
-                           QLineEdit#city_input{
-                           font-size:40px; 
-                           }
-                            QPushButton#weather_button{
-                           font-size:30px;
-                           font-weight:bold;
-                           }
-                           QLabel#temperature_label{
-                           font-size:75px;
-                           }
-                           QLabel#emoji_label{
-                           font-size:75px;
-                           font-family:Segeo UI emoji;
-                           color:orange;
-                           }
-                           QLabel#description{
-                           font-size:75px;
-                           }                       
-        """)
+        self.setStyleSheet(theme.stylesheet("weather"))
 
         self.get_weather_button.clicked.connect(self.get_weather)    
 
 
     def get_weather(self):
+        # imported here so opening the app doesn't pay for loading requests
+        import requests
+
         api_key = "b094093e3fbfc01dc34267eb591c1baf"
         city = self.city_input.text()
         url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}"
@@ -122,14 +100,19 @@ class WeatherApp(QWidget):
             self.display_error(f"Request Error:\n{req_error}")
 
 
+    def set_temperature_state(self, state):
+        if self.temperature_label.property("state") != state:
+            self.temperature_label.setProperty("state", state)
+            theme.repolish(self.temperature_label)
+
     def display_error(self, message):
         self.temperature_label.setText(message)
-        self.temperature_label.setStyleSheet("font-size:30px;")
+        self.set_temperature_state("error")
         self.emoji_label.clear()
         self.description.clear()
 
     def display_weather(self, data):
-        self.temperature_label.setStyleSheet("font-size:60px;")
+        self.set_temperature_state("weather")
         temperature_k = data["main"]["temp"]
         temperature_c = temperature_k - 273.15
         temperature_f = (temperature_k * 9/5) - 459.67
@@ -168,6 +151,8 @@ class WeatherApp(QWidget):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    stall_watchdog.install(app)
+    theme.engine.apply()
     weather_app = WeatherApp()
     weather_app.show()
     sys.exit(app.exec_())